@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from inspect import getmembers, isfunction
+
+import numpy as np
+
+import functions.mutation_functions
+import functions.population_functions
+import functions.selection_functions
+import main
+from functions import get_function
+from functions.population_functions import StagnationChecker
+from utils import algorithms
+from utils.algorithms import get_t_max
+from utils.population import Population
+
+# Reproducible throughput benchmarks of the engine (run from repository root):
+#     python -m benchmarks.benchmark --preset quick --output bench.json
+#     python -m benchmarks.benchmark --preset quick --compare bench.json --tolerance 0.15
+# Every case is run `repeat` times with fixed seeds, its median time is compared with the baseline
+# and the process exits with code 1 if any case is slower than the baseline by more than `tolerance`.
+
+BENCHMARK_VERSION = 1
+SEED = 2022
+POP_MIN = 1
+
+PRESETS = {
+    "quick": {"dimensions": [2, 10], "pop_max": [40, 1000], "q_names": ["f4", "f7", "ackley"],
+              "q_max": 20000, "repeat": 3},
+    "full": {"dimensions": [2, 10, 20, 30, 50, 100], "pop_max": [40, 100, 1000, 10000],
+             "q_names": ["f4", "f7", "ackley"], "q_max": 20000, "repeat": 5},
+}
+CASES = ("algorithm", "objective", "mutation", "selection", "schedule", "t_max")
+
+
+def schedules() -> list[str]:
+    return __module_functions(functions.population_functions)
+
+
+def mutations() -> list[str]:
+    return __module_functions(functions.mutation_functions)
+
+
+def selections() -> list[str]:
+    return __module_functions(functions.selection_functions)
+
+
+def run_benchmarks(dimensions: list[int], pop_max: list[int], q_names: list[str], q_max: int = 20000,
+                   repeat: int = 5, cases: tuple = CASES) -> dict:
+    """
+    Runs chosen benchmark cases over the whole grid of parameters.
+
+    Returns
+    -------
+    report: dict - {'meta': environment description, 'results': list of results of single cases}
+                   (result: {'case', 'params', 'key', 'times', 'min', 'median', 'evals_per_sec'} or
+                            {'case', 'params', 'key', 'error'} if the case could not be run)
+    """
+    results = []
+    if "algorithm" in cases:
+        for q_name, dims, pop_f_name, p_max in itertools.product(q_names, dimensions, schedules(), pop_max):
+            results.append(__measure("algorithm", {"q_name": q_name, "dims": dims, "pop_f_name": pop_f_name,
+                                                   "pop_max": p_max, "q_max": q_max},
+                                     partial(__algorithm, q_name, dims, pop_f_name, p_max, q_max), repeat))
+    if "objective" in cases:
+        for q_name, dims, p_max in itertools.product(q_names, dimensions, pop_max):
+            results.append(__measure("objective", {"q_name": q_name, "dims": dims, "batch": p_max},
+                                     partial(__objective, q_name, dims, p_max), repeat))
+    if "mutation" in cases:
+        for name, dims, p_max in itertools.product(mutations(), dimensions, pop_max):
+            results.append(__measure("mutation", {"function": name, "dims": dims, "pop_max": p_max},
+                                     partial(__mutation, name, dims, p_max), repeat))
+    if "selection" in cases:
+        for name, dims, p_max in itertools.product(selections(), dimensions, pop_max):
+            results.append(__measure("selection", {"function": name, "dims": dims, "pop_max": p_max},
+                                     partial(__selection, name, dims, p_max), repeat))
+    if "schedule" in cases:
+        for pop_f_name, p_max in itertools.product(schedules(), pop_max):
+            results.append(__measure("schedule", {"pop_f_name": pop_f_name, "pop_max": p_max, "q_max": q_max},
+                                     partial(__schedule, pop_f_name, p_max, q_max), repeat))
+    if "t_max" in cases:
+        for pop_f_name, p_max in itertools.product(schedules(), pop_max):
+            results.append(__measure("t_max", {"pop_f_name": pop_f_name, "pop_max": p_max, "q_max": q_max},
+                                     partial(__t_max, pop_f_name, p_max, q_max), repeat))
+    return {"meta": environment(), "results": results}
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.1, min_time: float = 1e-4) -> list[dict]:
+    """
+    Compares median times of cases present in both reports.
+
+    Returns
+    -------
+    list of {'key', 'baseline', 'current', 'ratio', 'regression'} - `ratio` is current / baseline median time,
+    `regression` is True when ratio exceeds 1 + tolerance and the case is slower by more than `min_time` [s]
+    (timer noise of very short cases is not reported)
+    """
+    baseline_results = {r["key"]: r for r in baseline["results"] if "median" in r}
+    comparison = []
+    for result in report["results"]:
+        reference = baseline_results.get(result["key"])
+        if "median" not in result or reference is None:
+            continue
+        ratio = result["median"] / reference["median"] if reference["median"] > 0 else float("inf")
+        comparison.append({"key": result["key"], "baseline": reference["median"], "current": result["median"],
+                           "ratio": ratio,
+                           "regression": ratio > 1 + tolerance and result["median"] - reference["median"] > min_time})
+    return comparison
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"version": BENCHMARK_VERSION, "date": datetime.now(timezone.utc).isoformat(), "commit": commit,
+            "python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "processor": platform.processor(), "cpu_count": os.cpu_count(), "seed": SEED}
+
+
+def __measure(case: str, params: dict, function, repeat: int) -> dict:
+    key = case + "|" + "|".join(f"{k}={v}" for k, v in sorted(params.items()))
+    result = {"case": case, "params": params, "key": key}
+    try:
+        function()      # warm up (imports, caches of numpy)
+        times, evaluations = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            evaluations = function()
+            times.append(time.perf_counter() - start)
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+        print(f"{key}: {result['error']}", file=sys.stderr)
+        return result
+    result.update({"times": times, "min": min(times), "median": statistics.median(times),
+                   "evals_per_sec": evaluations / statistics.median(times) if evaluations else None})
+    print(f"{key}: {result['median'] * 1000:.3f} ms", file=sys.stderr)
+    return result
+
+
+def __algorithm(q_name: str, dims: int, pop_f_name: str, pop_max: int, q_max: int) -> int:
+    pop_f = get_function.population(function_name=pop_f_name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, _, _, q_used = main.algorithm(point_start=tuple([50] * dims),
+                                         T_MAX=get_t_max(Q_MAX=q_max, pop_f=pop_f, POP_MIN=POP_MIN, POP_MAX=pop_max),
+                                         Q_MAX=q_max, pop_f=pop_f, POP_MIN=POP_MIN, POP_MAX=pop_max,
+                                         q=get_function.q(function_name=q_name),
+                                         mutation=get_function.mutation(function_name="gaussian_mutation"),
+                                         select=get_function.selection(function_name="tournament_selection_min"),
+                                         rng=np.random.default_rng(SEED), stagnation=StagnationChecker())
+    return q_used
+
+
+def __objective(q_name: str, dims: int, batch: int) -> int:
+    points = np.random.default_rng(SEED).uniform(-100, 100, (batch, dims))
+    get_function.q(function_name=q_name)(points)
+    return batch
+
+
+def __mutation(name: str, dims: int, pop_max: int) -> int:
+    rng = np.random.default_rng(SEED)
+    get_function.mutation(function_name=name)(rng.uniform(-100, 100, (pop_max, dims)), rng=rng)
+    return 0
+
+
+def __selection(name: str, dims: int, pop_max: int) -> int:
+    rng = np.random.default_rng(SEED)
+    population = Population(cords=rng.uniform(-100, 100, (pop_max, dims)), values=rng.uniform(0, 1000, pop_max))
+    get_function.selection(function_name=name)(population, pop_max, rng=rng)
+    return 0
+
+
+def __schedule(pop_f_name: str, pop_max: int, q_max: int) -> int:
+    # population sizes of the whole run, queried in the same way as in `algorithm(...)`
+    pop_f = get_function.population(function_name=pop_f_name)
+    t_max = get_t_max(Q_MAX=q_max, pop_f=pop_f, POP_MIN=POP_MIN, POP_MAX=pop_max)
+    rng = np.random.default_rng(SEED)
+    stagnation = StagnationChecker()
+    t, used, q, pop_size = 1, 0, None, None
+    while True:
+        pop_size = pop_f(t, t_max, POP_MIN, pop_max, q=q, current_pop_size=pop_size, stagnation=stagnation)
+        if used + pop_size > q_max:
+            return 0
+        used += pop_size
+        q = float(rng.uniform(0, 1000))
+        t += 1
+
+
+def __t_max(pop_f_name: str, pop_max: int, q_max: int) -> int:
+    getattr(algorithms, "__solve_t_max").cache_clear()     # memoized - solved from scratch every time
+    get_t_max(Q_MAX=q_max, pop_f=get_function.population(function_name=pop_f_name), POP_MIN=POP_MIN,
+              POP_MAX=pop_max)
+    return 0
+
+
+def __module_functions(module) -> list[str]:
+    return [name for name, member in getmembers(module, predicate=isfunction) if member.__module__ == module.__name__]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput benchmarks of the evolutionary algorithm.")
+    parser.add_argument("--preset", choices=PRESETS.keys(), default="quick")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--dimensions", nargs="+", type=int, help="overrides preset")
+    parser.add_argument("--pop-max", nargs="+", type=int, help="overrides preset")
+    parser.add_argument("--q-names", nargs="+", help="overrides preset")
+    parser.add_argument("--repeat", type=int, help="overrides preset")
+    parser.add_argument("--output", help="json file for results (printed to stdout if not given)")
+    parser.add_argument("--compare", help="json file with baseline results")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown (0.1 - 10%%)")
+    parser.add_argument("--min-time", type=float, default=1e-4, help="ignored absolute slowdown [s]")
+    args = parser.parse_args()
+
+    settings = dict(PRESETS[args.preset])
+    for name in ("dimensions", "pop_max", "q_names", "repeat"):
+        if getattr(args, name) is not None:
+            settings[name] = getattr(args, name)
+    benchmark_report = run_benchmarks(cases=tuple(args.cases), **settings)
+    benchmark_report["meta"]["settings"] = settings
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(benchmark_report, f, indent=4)
+    elif not args.compare:
+        print(json.dumps(benchmark_report, indent=4))
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline_report = json.load(f)
+        comparison = compare(benchmark_report, baseline_report, tolerance=args.tolerance, min_time=args.min_time)
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['key']:<90} {row['baseline'] * 1000:10.3f} ms {row['current'] * 1000:10.3f} ms "
+                  f"{row['ratio']:6.2f}x {flag}")
+        regressions = sum(row["regression"] for row in comparison)
+        print(f"{len(comparison)} cases compared, {regressions} regressions (tolerance {args.tolerance:.0%})")
+        sys.exit(1 if regressions else 0)
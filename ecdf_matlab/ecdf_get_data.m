@@ -1,3 +1,6 @@
+% Skrypt czyta stare (tekstowe) logi ecdf_data\<pop_f>_<i>.txt (f7, 2 wymiary) zapisywane przed zmianą formatu.
+% Nowe logi (ecdf_data\<q>_<dims>\<pop_f>_<i>.npz) nie są przez niego czytane - zastępuje go
+% "python -m utils.ecdf" (te same wykresy: "Zestawienie krzywych ECDF" i "Dystrybuanty empiryczne").
 % najmniejsza ilość iteracji dla funkcji reset: 987 (+1)
 
 pop_f_names = ["constant", "linear_increase", "linear_decrease", "exponential_increase", "exponential_decrease", "sin_wave_change", "rect_wave_change", "rect_wave_change_on_stagnation"];
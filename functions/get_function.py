@@ -1,5 +1,8 @@
+import hashlib
+from functools import partial, update_wrapper
 from inspect import getmembers, isfunction
 
+import numpy as np
 import typing
 
 try:
@@ -12,6 +15,7 @@ import functions.mutation_functions
 import functions.population_functions
 import functions.selection_functions
 import functions.objective_functions
+from utils.evaluation import CachedObjective
 
 
 def mutation(function_name: str = "") -> typing.Callable or None:
@@ -29,14 +33,68 @@ def selection(function_name: str = "") -> typing.Callable or None:
                         members=getmembers(functions.selection_functions, predicate=isfunction))
 
 
-def q(function_name: str = "f4") -> typing.Callable or None:
-    for function in cec2017.functions.all_functions:
-        if function.__name__ == function_name.strip():
-            return function
+def q(function_name: str = "f4", cache_size: int = None, count_hits: bool = True,
+      shift=None, rotation=None) -> typing.Callable or None:
+    """
+    Returns objective function of given name, optionally wrapped in LRU cache of `cache_size` points
+    (see `utils.evaluation.CachedObjective`, `count_hits` - whether cache hits are counted towards the budget).
+    Built-in functions (`functions.objective_functions`) can be shifted by `shift` and rotated by `rotation`
+    (orthogonal matrix or seed of random rotation), such function is named after both (e.g. 'ackley_shift30.0').
+    """
+    function = None
+    for cec_function in cec2017.functions.all_functions:
+        if cec_function.__name__ == function_name.strip():
+            function = cec_function
+            break
+    else:
+        # only functions defined in the module (not imported ones), its private helpers are not objective functions
+        function = __get_member(member_name=function_name,
+                                members=[(name, member) for name, member
+                                         in getmembers(functions.objective_functions, predicate=isfunction)
+                                         if member.__module__ == functions.objective_functions.__name__
+                                         and not name.startswith("_")])
 
-    return __get_member(member_name=function_name,
-                        members=getmembers(functions.objective_functions, predicate=isfunction))
+    if function and (shift is not None or rotation is not None):
+        if function.__module__ != functions.objective_functions.__name__:
+            raise Exception(f"Shift and rotation are supported only by built-in objective functions, "
+                            f"not by: {function_name}")
+        function = update_wrapper(partial(function, shift=shift, rotation=rotation), function)
+        # distinct name of transformed function (names are keys of cached surfaces, checkpoints, ...)
+        function.__name__ = __transformed_name(function.__name__, shift=shift, rotation=rotation)
+
+    if function and cache_size:
+        return CachedObjective(q=function, max_size=cache_size, count_hits=count_hits)
+    return function
+
+
+def optimum(function_name: str = "f4", bounds: tuple = (-100, 100)) -> float or None:
+    """
+    Known optimal value of objective function: 100 * n for CEC2017 function fn, 0 for built-in functions
+    (not shifted ones - shift moves only the optimum point), None for unknown function.
+    None as well for built-in function whose optimum point lies outside of the search domain `bounds`
+    (e.g. schwefel, optimal at 420.97 in every dimension) - its optimal value can not be reached there.
+    """
+    function_name = function_name.strip()
+    if any(cec_function.__name__ == function_name for cec_function in cec2017.functions.all_functions):
+        return 100.0 * int(function_name[1:])
+    if q(function_name=function_name) is not None:
+        optimum_point = functions.objective_functions.OPTIMUM_POINTS.get(function_name, 0.0)
+        return 0.0 if bounds[0] <= optimum_point <= bounds[1] else None
+    return None
+
+
+def __transformed_name(function_name: str, shift=None, rotation=None) -> str:
+    # e.g. 'ackley_shift30.0_rot7', arrays (shift vector, rotation matrix) are represented by hash of their values
+    def describe(value) -> str:
+        if np.ndim(value) == 0:
+            return str(value)
+        return hashlib.sha1(np.ascontiguousarray(value, dtype=np.float64).tobytes()).hexdigest()[:10]
 
+    if shift is not None:
+        function_name += f"_shift{describe(shift)}"
+    if rotation is not None:
+        function_name += f"_rot{describe(rotation)}"
+    return function_name
 
 
 def __get_member(member_name: str, members: list[tuple]) -> typing.Callable or None:
@@ -1,25 +1,42 @@
-import random
-
-
-def gaussian_mutation(point):
-    max_lim = 100            # constant
-    min_lim = -max_lim       # constant
-    sigma = 1                # constant
-    new_point = []
-    for cord in point:
-        new_cord = random.gauss(cord, sigma)
-        new_cord = min(max_lim, max(new_cord, min_lim))
-        new_point.append(new_cord)
-    return tuple(new_point)
-
-
-def uniform_mutation(point):
-    max_lim = 100           # constant
-    min_lim = -max_lim      # constant
-    max_diff = 1            # constant
-    new_point = []
-    for cord in point:
-        new_cord = random.uniform(max_diff, -max_diff)
-        new_cord = min(max_lim, max(new_cord, min_lim))
-        new_point.append(new_cord)
-    return tuple(new_point)
+import numpy as np
+
+
+def gaussian_mutation(points, rng: np.random.Generator = None, sigma: float = 1.0, bounds: tuple = (-100, 100)):
+    """
+    Mutates whole matrix of points at once by adding gaussian noise, clamping result to the box `bounds`.
+
+    Parameters
+    ----------
+    points : array of shape (N, D) or (D,) - points to mutate
+    rng : numpy.random.Generator - (seeded) random generator, new unseeded one is created if not given
+    sigma : float - standard deviation of the mutation
+    bounds : tuple - (min, max) limits of every coordinate
+
+    Returns
+    -------
+    new_points : array of the same shape as `points`
+    """
+    rng = rng if rng else np.random.default_rng()
+    points = np.asarray(points, dtype=np.float64)
+    return np.clip(points + rng.normal(0.0, sigma, size=points.shape), bounds[0], bounds[1])
+
+
+def uniform_mutation(points, rng: np.random.Generator = None, sigma: float = 1.0, bounds: tuple = (-100, 100)):
+    """
+    Mutates whole matrix of points at once by adding noise from U(-sigma, sigma),
+    clamping result to the box `bounds`.
+
+    Parameters
+    ----------
+    points : array of shape (N, D) or (D,) - points to mutate
+    rng : numpy.random.Generator - (seeded) random generator, new unseeded one is created if not given
+    sigma : float - maximum change of a single coordinate
+    bounds : tuple - (min, max) limits of every coordinate
+
+    Returns
+    -------
+    new_points : array of the same shape as `points`
+    """
+    rng = rng if rng else np.random.default_rng()
+    points = np.asarray(points, dtype=np.float64)
+    return np.clip(points + rng.uniform(-sigma, sigma, size=points.shape), bounds[0], bounds[1])
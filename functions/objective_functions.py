@@ -1,6 +1,74 @@
-from math import exp, sqrt, cos, pi, e
+from functools import lru_cache
 
+import numpy as np
+from math import pi, e
 
-def ackley(datapoint):
-    x, y = datapoint
-    return -20.0 * exp(-0.2 * sqrt(0.5 * (x ** 2 + y ** 2))) - exp(0.5 * (cos(2 * pi * x) + cos(2 * pi * y))) + e + 20
+# Every objective function works both for a single point of shape (D,) (returns single value)
+# and for a batch of points of shape (M, D) (returns array of shape (M,)), for any dimension D.
+# Optional transformation of the domain (evaluated in z = rotation @ (x - shift)):
+#     shift - float or array of shape (D,), the optimum is moved from 0 (1 for rosenbrock, 420.97 for schwefel)
+#             by `shift`,
+#     rotation - orthogonal matrix of shape (D, D) or int seed of random rotation of any dimension.
+# Functions are found by name with `get_function.q(...)` (shift and rotation can be given there as well).
+
+# coordinate of the optimum (the same in every dimension) of not transformed functions, other than 0
+OPTIMUM_POINTS = {"rosenbrock": 1.0, "schwefel": 420.9687462275036}
+
+
+def ackley(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = (-20.0 * np.exp(-0.2 * np.sqrt(np.mean(z ** 2, axis=1))) - np.exp(np.mean(np.cos(2 * pi * z), axis=1))
+              + e + 20)
+    return result[0] if single else result
+
+
+def rastrigin(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = 10.0 * z.shape[1] + np.sum(z ** 2 - 10.0 * np.cos(2 * pi * z), axis=1)
+    return result[0] if single else result
+
+
+def rosenbrock(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = np.sum(100.0 * (z[:, 1:] - z[:, :-1] ** 2) ** 2 + (1.0 - z[:, :-1]) ** 2, axis=1)
+    return result[0] if single else result
+
+
+def sphere(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = np.einsum("ij,ij->i", z, z)
+    return result[0] if single else result
+
+
+def griewank(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = (1.0 + np.einsum("ij,ij->i", z, z) / 4000.0
+              - np.prod(np.cos(z / np.sqrt(np.arange(1, z.shape[1] + 1))), axis=1))
+    return result[0] if single else result
+
+
+def schwefel(datapoint, shift=None, rotation=None):
+    z, single = _transform(datapoint, shift, rotation)
+    result = 418.9828872724338 * z.shape[1] - np.sum(z * np.sin(np.sqrt(np.abs(z))), axis=1)
+    return result[0] if single else result
+
+
+def _transform(datapoint, shift=None, rotation=None) -> tuple[np.ndarray, bool]:
+    # points as (M, D) array (moved by `shift` and rotated), True if single point was given
+    points = np.asarray(datapoint, dtype=np.float64)
+    single = points.ndim == 1
+    points = points.reshape(1, -1) if single else points
+    if shift is not None:
+        points = points - shift
+    if rotation is not None:
+        if isinstance(rotation, (int, np.integer)):
+            rotation = _random_rotation(points.shape[1], int(rotation))
+        points = points @ np.asarray(rotation).T
+    return points, single
+
+
+@lru_cache(maxsize=32)
+def _random_rotation(dims: int, seed: int) -> np.ndarray:
+    # random orthogonal matrix (uniformly distributed - QR decomposition of gaussian matrix with fixed signs)
+    q, r = np.linalg.qr(np.random.default_rng(seed).normal(size=(dims, dims)))
+    return q * np.sign(np.diag(r))
@@ -1,5 +1,10 @@
 import math
 
+
+def const(t, t_max, pop_min, pop_max, **kwargs):
+    return pop_max
+
+
 def linear_increase(t, t_max, pop_min, pop_max, **kwargs):
     return math.floor(pop_min + ((pop_max - pop_min) * t / t_max))
 
@@ -25,7 +30,7 @@ def sin_wave_change(t, t_max, pop_min, pop_max, **kwargs):
 
 
 def rect_wave_change(t, t_max, pop_min, pop_max, **kwargs):
-    step_width = math.floor(t_max / 10)  # constant
+    step_width = max(1, math.floor(t_max / 10))  # constant (at least 1 generation for t_max < 10)
     if t % (2 * step_width) < step_width:
         pop = pop_min
     else:
@@ -33,42 +38,81 @@ def rect_wave_change(t, t_max, pop_min, pop_max, **kwargs):
     return pop
 
 
-def __stagnation_checker_generator(q_keep, q_tol):
-    q_log = []
-
-    while True:
-        # acquire current q value
-        q = yield
-
+class StagnationChecker:
+
+    def __init__(self, q_keep: int = 50, q_tol: float = 0.5):
+        """
+        Per-run stagnation detector: stagnation is detected when q value does not differ
+        from mean of `q_keep` previous q values by more than `q_tol`.
+        Previous values are kept in a ring buffer with running sum, so every check costs O(1).
+
+        Parameters
+        ----------
+        q_keep : int
+            Number of previous q values taken into account.
+        q_tol : float
+            Tolerance of difference between current q value and mean of previous ones.
+        """
+        self.q_keep = q_keep
+        self.q_tol = q_tol
+        self.reset()
+
+    def reset(self):
+        self.__q_log = [0.0] * self.q_keep    # ring buffer of previous q values
+        self.__index = 0                      # index of the oldest q value (overwritten next)
+        self.__count = 0                      # number of q values in buffer
+        self.__sum = 0.0                      # running sum of q values in buffer
+
+    def get_state(self) -> dict:
+        # for checkpoints (see `utils.checkpoint.Checkpointer`)
+        return {"q_keep": self.q_keep, "q_tol": self.q_tol, "q_log": list(self.__q_log),
+                "index": self.__index, "count": self.__count, "sum": self.__sum}
+
+    def set_state(self, state: dict):
+        self.q_keep, self.q_tol = state["q_keep"], state["q_tol"]
+        self.__q_log = [float(q) for q in state["q_log"]]
+        self.__index, self.__count, self.__sum = state["index"], state["count"], state["sum"]
+
+    def check(self, q: float) -> bool:
+        """
+        Checks current q value for stagnation.
+
+        Returns
+        -------
+        stagnate : bool - True if stagnation was detected (history is then cleared)
+        """
         # initialisation or no stagnation detected
-        if (len(q_log) < q_keep) or (abs(q - (sum(q_log) / q_keep)) > q_tol):
-            # save current q value
-            if len(q_log) < q_keep:
-                q_log.append(q)
+        if (self.__count < self.q_keep) or (abs(q - (self.__sum / self.q_keep)) > self.q_tol):
+            # save current q value (replacing the oldest one if buffer is full)
+            if self.__count == self.q_keep:
+                self.__sum -= self.__q_log[self.__index]
             else:
-                q_log = [*q_log[1:], q]
-            yield False
-
+                self.__count += 1
+            self.__q_log[self.__index] = q
+            self.__sum += q
+            self.__index = (self.__index + 1) % self.q_keep
+            if self.__index == 0:
+                self.__sum = math.fsum(self.__q_log[:self.__count])   # avoid accumulating rounding errors
+            return False
 
         # stagnation detected!
         else:
-            q_log = []
-            yield True
-
+            self.reset()
+            return True
 
-# STAGNATION GENERATOR INITIALISATION
-stagnation_checker_generator = __stagnation_checker_generator(q_keep=50, q_tol=0.5)
 
-
-def rect_wave_change_on_stagnation(t, t_max, pop_min, pop_max, q=None, current_pop_size=None, **kwargs):
+def rect_wave_change_on_stagnation(t, t_max, pop_min, pop_max, q=None, current_pop_size=None,
+                                   stagnation: StagnationChecker = None, **kwargs):
     if q is None or current_pop_size is None:
         return pop_min
 
     if current_pop_size != pop_min and current_pop_size != pop_max:
         raise Exception("current_pop_size must be equal to either pop_max or pop_min")
 
-    next(stagnation_checker_generator)
-    stagnate = stagnation_checker_generator.send(q)
+    if stagnation is None:
+        raise Exception("rect_wave_change_on_stagnation requires per-run `stagnation` state (StagnationChecker)")
+
+    stagnate = stagnation.check(q)
 
     if not stagnate:
         return current_pop_size
@@ -82,8 +126,9 @@ def rect_wave_change_on_stagnation(t, t_max, pop_min, pop_max, q=None, current_p
 
 if __name__ == "__main__":
     pop_f = rect_wave_change_on_stagnation
+    stagnation = StagnationChecker(q_keep=5, q_tol=0.5)
     current_pop_size = 10
     for i in range(30):
-        new_pop_size = pop_f(0, 0, 0, 10, q=5, current_pop_size=current_pop_size)
+        new_pop_size = pop_f(0, 0, 0, 10, q=5, current_pop_size=current_pop_size, stagnation=stagnation)
         print(new_pop_size)
         current_pop_size = new_pop_size
@@ -1,21 +1,40 @@
-import random
-from utils.algorithms import max_value_points_from_dictionary
-from utils.algorithms import min_value_points_from_dictionary
-
-
-def tournament_selection_max(population):
-    s = 5           # constant
-    tournament = {}
-    for i in range(s):
-        random_key = random.choice(list(population.keys()))
-        tournament[random_key] = population[random_key]
-    return max_value_points_from_dictionary(tournament, 1)[0]
-
-
-def tournament_selection_min(population):
-    s = 5           # constant
-    tournament = {}
-    for i in range(s):
-        random_key = random.choice(list(population.keys()))
-        tournament[random_key] = population[random_key]
-    return min_value_points_from_dictionary(tournament, 1)[0]
+import numpy as np
+
+from utils.population import Population
+
+# every selection function has the same interface:
+#     select(population, n, rng=None, **params) -> parents
+# where `parents` is an array of shape (n, D) with coordinates of `n` selected points (repetitions allowed)
+
+
+def tournament_selection_max(population: Population, n: int, rng: np.random.Generator = None, s: int = 5):
+    rng = rng if rng else np.random.default_rng()
+    tournaments = rng.integers(0, len(population), size=(n, s))
+    winners = tournaments[np.arange(n), np.argmax(population.values[tournaments], axis=1)]
+    return population.cords[winners]
+
+
+def tournament_selection_min(population: Population, n: int, rng: np.random.Generator = None, s: int = 5):
+    rng = rng if rng else np.random.default_rng()
+    tournaments = rng.integers(0, len(population), size=(n, s))
+    winners = tournaments[np.arange(n), np.argmin(population.values[tournaments], axis=1)]
+    return population.cords[winners]
+
+
+def truncation_selection_min(population: Population, n: int, rng: np.random.Generator = None, ratio: float = 0.5):
+    rng = rng if rng else np.random.default_rng()
+    keep = max(1, int(np.ceil(ratio * len(population))))
+    best = np.argpartition(population.values, keep - 1)[:keep]
+    return population.cords[best[rng.integers(0, keep, size=n)]]
+
+
+def rank_selection_min(population: Population, n: int, rng: np.random.Generator = None, pressure: float = 1.5):
+    # linear ranking, `pressure` in [1, 2] is the expected number of copies of the best point
+    rng = rng if rng else np.random.default_rng()
+    size = len(population)
+    if size == 1:
+        return np.repeat(population.cords, n, axis=0)
+    ranks = np.empty(size)
+    ranks[np.argsort(population.values)] = np.arange(size - 1, -1, -1)  # best point has rank `size - 1`
+    probabilities = (2 - pressure) / size + 2 * ranks * (pressure - 1) / (size * (size - 1))
+    return population.cords[rng.choice(size, size=n, p=probabilities)]
@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main import new_seed, run_experiment, spawn_seed
+from utils.migration import MigrationBuffer, Migration
+from utils.results import results_path, save_result
+
+
+def split_budget(Q_MAX: int, islands: int) -> list[int]:
+    """
+    Destination function budget of every island - `Q_MAX` split as evenly as possible, summing exactly to `Q_MAX`.
+    """
+    return [Q_MAX // islands + (1 if i < Q_MAX % islands else 0) for i in range(islands)]
+
+
+def run_islands(q_name: str, dimensions: int, pop_f_names: list[str], Q_MAX: int = 20000,
+                pop_limits: dict = None, interval: int = 10, migrants: int = 2, seed: int = None) -> dict:
+    """
+    Island model - one hard run of the algorithm spread over `len(pop_f_names)` processes.
+    Island i evolves its own population with population function `pop_f_names[i]` and budget
+    `split_budget(Q_MAX, islands)[i]`. Every `interval` generations islands (connected in a ring) exchange
+    `migrants` best individuals through shared memory (see `utils.migration.MigrationBuffer`).
+    Exchange is synchronised by migration epochs, so the whole run is reproducible with the same `seed`.
+
+    Parameters
+    ----------
+    q_name: str - objective function name
+    dimensions: int - dimension of the problem
+    pop_f_names: list of population function names, one for every island
+    Q_MAX: int - destination function budget of the whole run
+    pop_limits: dict - {pop_f_name: (pop_min, pop_max)}, (1, 40) if pop_f_name not given
+    interval: int - number of generations between migrations
+    migrants: int - number of individuals sent by an island in one migration
+    seed: int - island i (counting from 1) is seeded with `spawn_seed(seed, i)`, new seed if not given
+
+    Returns
+    -------
+    result: dict - best value and cords of all islands, used budget (sum of budgets used by islands),
+                   wall time and list of results of every island
+    """
+    pop_limits = pop_limits if pop_limits else {}
+    seed = seed if seed is not None else new_seed()
+    budgets = split_budget(Q_MAX, len(pop_f_names))
+    buffer = MigrationBuffer(islands=len(pop_f_names), migrants=migrants, dims=dimensions)
+    run_time = time.perf_counter()
+    try:
+        # every island must run at the same time (islands wait for migrants of each other)
+        with ProcessPoolExecutor(max_workers=len(pop_f_names)) as executor:
+            futures = []
+            for island, (pop_f_name, q_max) in enumerate(zip(pop_f_names, budgets)):
+                pop_min, pop_max = pop_limits.get(pop_f_name, (1, 40))
+                futures.append(executor.submit(_island_run, island=island, buffer_name=buffer.name,
+                                               islands=len(pop_f_names), migrants=migrants, interval=interval,
+                                               q_name=q_name, dimensions=dimensions, pop_f_name=pop_f_name,
+                                               pop_min=pop_min, pop_max=pop_max, q_max=q_max,
+                                               seed=spawn_seed(seed, island + 1)))
+            results = [future.result() for future in futures]
+    finally:
+        buffer.close()
+    run_time = time.perf_counter() - run_time
+
+    q_used = sum(result["q_used"] for result in results)
+    if q_used > Q_MAX:
+        raise Exception(f"Islands used {q_used} evaluations, more than budget Q_MAX = {Q_MAX}")
+    best = min(results, key=lambda result: result["best_value"])
+    return {"best_value": best["best_value"], "best_cords": best["best_cords"], "q_used": q_used,
+            "seed": seed, "run_time": run_time, "islands": results}
+
+
+def save_islands_result(q_name: str, pop_f_names: list[str], dims: int, result: dict):
+    # saved as population function 'islands' with island schedules as variant of the experiment
+    dirname = os.path.dirname(__file__)
+    path_to_file = results_path(q_name, "islands", dims, data_dir=os.path.join(dirname, "data"),
+                                variant="-".join(pop_f_names))
+    save_result(path_to_file, value=result["best_value"], cords=result["best_cords"], seed=result["seed"],
+                q_used=result["q_used"], run_time=result["run_time"])
+
+
+def _island_run(island: int, buffer_name: str, islands: int, migrants: int, interval: int,
+                q_name: str, dimensions: int, pop_f_name: str, pop_min: int, pop_max: int, q_max: int, seed: int):
+    # executed in worker process
+    buffer = MigrationBuffer(islands=islands, migrants=migrants, dims=dimensions, name=buffer_name)
+    migration = Migration(buffer=buffer, island=island, interval=interval)
+    try:
+        elite, pop_size_log, budget_log, q_used, t_max, run_time = run_experiment(q_name=q_name,
+                                                                                  dimensions=dimensions,
+                                                                                  pop_f_name=pop_f_name,
+                                                                                  pop_min=pop_min, pop_max=pop_max,
+                                                                                  seed=seed, q_max=q_max,
+                                                                                  migration=migration)
+    finally:
+        # neighbours must not wait for this island any more (also when it failed)
+        migration.finish()
+        buffer.close()
+    return {"island": island, "pop_f_name": pop_f_name, "best_value": elite.best_value,
+            "best_cords": elite.best_cords, "q_used": q_used, "q_max": q_max, "generations": len(pop_size_log) - 1,
+            "migrations": migration.epoch, "received": migration.received, "run_time": run_time}
+
+
+if __name__ == "__main__":
+    _POP_F_NAMES = ["linear_increase", "linear_decrease", "exponential_increase", "exponential_decrease",
+                    "sin_wave_change", "rect_wave_change", "const", "const"][:os.cpu_count() or 1]
+    islands_result = run_islands(q_name="f7", dimensions=100, pop_f_names=_POP_F_NAMES, Q_MAX=20000 * 10,
+                                 pop_limits={"const": (5, 5)}, interval=10, migrants=2)
+    for island_result in islands_result["islands"]:
+        print(f"[{island_result['island']}, {island_result['pop_f_name']}] -> {island_result['best_value']} "
+              f"({island_result['q_used']}/{island_result['q_max']}, migrations: {island_result['migrations']})")
+    print(f"NAJLEPSZA WARTOŚĆ: {islands_result['best_value']}, "
+          f"WYKORZYSTANY BUDŻET FUNKCJI CELU: {islands_result['q_used']}")
+    save_islands_result("f7", _POP_F_NAMES, 100, islands_result)
@@ -2,9 +2,12 @@
 import math
 import time
 import os
+import itertools
 
 # from utils.DataVisualiser import DataVisualiser
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from contextlib import nullcontext
+from functools import partial
 from typing import Callable
 
 import cec2017.functions
@@ -12,32 +15,78 @@ import numpy
 from cec2017 import functions
 
 from utils.DataVisualiser import DataVisualiser
-from utils.algorithms import min_value_points_from_dictionary, get_t_max
+from utils.algorithms import get_t_max
+from utils.archive import Archive
+from utils.budget_log import BudgetLog, log_checkpoints
+from utils.checkpoint import Checkpointer, checkpoint_path
+from utils.ecdf import ecdf_targets, ecdf_values
+from utils.elite import EliteTracker
+from utils.evaluation import Evaluator
+from utils.migration import Migration
+from utils.population import Population
+from utils.profiling import NULL_TIMER, PhaseTimer
+from utils.results import NO_SEED, NO_VALUE, load_results, results_path, save_result
+from utils.stopping import StoppingRules
 from functions import get_function
+from functions.population_functions import StagnationChecker
 
 
 # UTILS
-def save_to_data(q_name, pop_f_name, dims, b_cords, b_value):
+def save_to_data(q_name, pop_f_name, dims, b_cords, b_value, seed=None, q_used=None, run_time=None):
     dirname = os.path.dirname(__file__)
-    filename = f"data/{q_name}_{pop_f_name}_{dims}.txt"  # DLA 5,5 DODAĆ CONST ZAMIAST POP_F_NAME
-    path_to_file = os.path.join(dirname, filename)
-    with open(path_to_file, "a+") as f:
-        f.write(''.join('{}\t{}\n'.format(b_value, b_cords)))
+    path_to_file = results_path(q_name, pop_f_name, dims, data_dir=os.path.join(dirname, "data"))
+    save_result(path_to_file, value=b_value, cords=b_cords, seed=seed, q_used=q_used, run_time=run_time)
+
+
+def finished_runs(q_name, pop_f_name, dims) -> dict[int, float]:
+    # {seed: best value} of runs already saved in results file
+    dirname = os.path.dirname(__file__)
+    path_to_file = results_path(q_name, pop_f_name, dims, data_dir=os.path.join(dirname, "data"))
+    if not os.path.exists(path_to_file):
+        return {}
+    results = load_results(path_to_file)
+    return dict(zip(results["seed"].tolist(), results["value"].tolist()))
 
 
-def save_to_ecdf_data(pop_f_name, best_q_log, no):
-    # meant for f7 2-dimensional q-function 
+def save_to_profile_data(q_name, pop_f_name, dims, profiler: PhaseTimer, no, seed=None):
     dirname = os.path.dirname(__file__)
-    filename = f"ecdf_data/{pop_f_name}_{no}.txt"
+    filename = f"profile_data/{q_name}_{dims}/{pop_f_name}_{no}.json"
+    profiler.save(os.path.join(dirname, filename), q_name=q_name, pop_f_name=pop_f_name, dims=dims, no=no, seed=seed)
+
+
+def save_to_ecdf_data(q_name, pop_f_name, dims, budget_log: BudgetLog, no, seed=None, pop_size_log: list = None,
+                      stopping: StoppingRules = None):
+    dirname = os.path.dirname(__file__)
+    filename = f"ecdf_data/{q_name}_{dims}/{pop_f_name}_{no}.npz"
     path_to_file = os.path.join(dirname, filename)
-    with open(path_to_file, "a+") as f:
-        f.write(''.join('{}\n'.format(best_q_log)))
+    os.makedirs(os.path.dirname(path_to_file), exist_ok=True)
+    numpy.savez(path_to_file, checkpoints=budget_log.checkpoints, values=budget_log.values,
+                seed=numpy.uint64(seed if seed is not None else NO_SEED),
+                pop_sizes=numpy.array(pop_size_log if pop_size_log else [], dtype=numpy.int64).reshape(-1, 2),
+                stop_reason=numpy.str_(stopping.reason if stopping else "budget"),
+                evaluations_to_target=numpy.int64(stopping.evaluations_to_target
+                                                  if stopping and stopping.evaluations_to_target is not None
+                                                  else NO_VALUE))
+
+
+def new_seed() -> int:
+    return int(numpy.random.SeedSequence().generate_state(1, numpy.uint64)[0])
+
+
+def spawn_seed(base_seed: int, no: int) -> int:
+    # seed of run `no`, derived from `base_seed` - independent of order in which runs are executed
+    return int(numpy.random.SeedSequence(base_seed, spawn_key=(no,)).generate_state(1, numpy.uint64)[0])
+
+
+def spawn_rngs(seed: int, n: int) -> list[numpy.random.Generator]:
+    # `n` independent random generators of one run (algorithm, archive, ...)
+    return [numpy.random.default_rng(s) for s in numpy.random.SeedSequence(seed).spawn(n)]
 
 
 def calc_z_limits(q: Callable):
     z_limits = (0, 30)
     q_name = q.__name__
-    if 'f' in q_name:
+    if q_name.startswith('f') and q_name[1:].isdigit():
         z_lim = float(q_name[1:]) * 100.0
         z_limits = (z_lim - 100.0, z_lim + 300.0)
     return z_limits
@@ -46,77 +95,170 @@ def calc_z_limits(q: Callable):
 # ALGORITHM
 def initialise_algorithm(point_start: tuple, T_MAX: int,
                          pop_f: Callable, POP_MIN: int, POP_MAX: int,
-                         q: Callable, mutation: Callable,
+                         evaluate: Evaluator, mutation: Callable, rng: numpy.random.Generator,
+                         elite: EliteTracker, budget_log: BudgetLog, archive: Archive = None,
                          live_plot: DataVisualiser = None):
-    pop, log = {}, {}
+    point_start = numpy.asarray(point_start, dtype=numpy.float64)
     pop_size = pop_f(0, T_MAX, POP_MIN, POP_MAX)
-    log[point_start] = q(point_start)
-    for i in range(pop_size):
-        new_point = mutation(point_start)
-        pop[new_point] = q(new_point)
-        log[new_point] = q(new_point)
+    pop = Population(cords=mutation(numpy.tile(point_start, (pop_size, 1)), rng=rng))
+
+    # starting point and initial population evaluated in one call (not counted towards the budget)
+    initial = Population(cords=numpy.vstack([point_start, pop.cords]))
+    initial.values[:] = evaluate(initial.cords, count=False)
+    pop.values[:] = initial.values[1:]
+    elite.update(initial)
+    budget_log.record(initial.values, count=False)
+    if archive:
+        archive.add(initial)
 
     if live_plot:
-        init_plot_multiprocess(live_plot=live_plot, q=q, data=log)
-        time.sleep(2.0)
+        init_plot_multiprocess(live_plot=live_plot, q=evaluate.q, data=initial.as_points())
 
     pop_size_log = [(0, pop_size)]
-    best_q_log = [(0, min(log.values()))]
 
-    return pop, log, pop_size_log, best_q_log
+    return pop, pop_size_log
 
 
 def algorithm(point_start: tuple, T_MAX: int, Q_MAX: int,
               pop_f: Callable, POP_MIN: int, POP_MAX: int,
               q: Callable, mutation: Callable, select: Callable,
-              live_plot: DataVisualiser = None):
-    # POPULATION INITIALISATION
-    pop, log, pop_size_log, best_q_log = initialise_algorithm(point_start=point_start, T_MAX=T_MAX,
-                                                              pop_f=pop_f, POP_MIN=POP_MIN, POP_MAX=POP_MAX,
-                                                              q=q, mutation=mutation, live_plot=live_plot)
-
-    new_pop = {}
-    q_counter, t = 0, 1
-    q_value, q_best_value, pop_size = None, None, None
+              live_plot: DataVisualiser = None, rng: numpy.random.Generator = None,
+              archive: Archive = None, elite_k: int = 1, stagnation: StagnationChecker = None,
+              checkpoints: numpy.ndarray = None, profiler: PhaseTimer = None, migration: Migration = None,
+              checkpoint: Checkpointer = None, stopping: StoppingRules = None):
+    """
+    Mutational evolutionary algorithm with population size changing according to `pop_f`.
+    Per-run state of adaptive population functions (`stagnation`) is passed to `pop_f` on every call,
+    new one is created if not given.
+    If `profiler` is given, wall time of every phase (pop_f, select, mutation, q, logging) of every generation
+    is recorded in it (see `utils.profiling.PhaseTimer`).
+    If `migration` is given, population exchanges migrants with other islands every `migration.interval`
+    generations (see `islands.run_islands(...)`), migrants are not counted towards the budget of this run.
+    If `checkpoint` is given, state of the run is saved periodically, and the run is resumed from its file
+    if it exists (continued exactly as it would run without interruption; contents of archive and of cache
+    of objective function values are not saved).
+    If `stopping` is given, the run may end before the budget is used (target value reached, no improvement,
+    wall time limit - see `utils.stopping.StoppingRules`), stop reason is recorded in it.
+
+    Returns
+    -------
+    elite: EliteTracker - best point(s) found
+    pop_size_log: list of (t, population size) tuples
+    budget_log: BudgetLog - best value found so far at `checkpoints` (numbers of used evaluations),
+                            logarithmically spaced up to Q_MAX if not given
+    q_counter: int - used destination function budget
+    """
+    rng = rng if rng else numpy.random.default_rng()
+    evaluate = Evaluator(q=q)
+    elite = EliteTracker(k=elite_k)
+    budget_log = BudgetLog(checkpoints=checkpoints if checkpoints is not None else log_checkpoints(Q_MAX))
+    stagnation = stagnation if stagnation else StagnationChecker()
+    timer = profiler if profiler else NULL_TIMER
+    timer.start()
+
+    run = {"q": evaluate.q.__name__, "dims": len(point_start), "T_MAX": T_MAX, "Q_MAX": Q_MAX,
+           "pop_f": pop_f.__name__, "POP_MIN": POP_MIN, "POP_MAX": POP_MAX}
+    state = checkpoint.load() if checkpoint else None
+
+    if state:
+        # RESUMING FROM CHECKPOINT
+        if state["run"] != run:
+            raise Exception(f"Checkpoint {checkpoint.path} was saved by a different run: {state['run']}")
+        t, pop_size, q_best_value = state["t"], state["pop_size"], state["q_best_value"]
+        pop = Population(cords=state["pop_cords"], values=state["pop_values"])
+        pop_size_log = [tuple(row) for row in state["pop_size_log"].tolist()]
+        evaluate.q_counter = state["q_counter"]
+        elite.set_state(state["elite"])
+        budget_log.set_state(state["budget_log"])
+        stagnation.set_state(state["stagnation"])
+        rng.bit_generator.state = state["rng"]
+        if stopping and "stopping" in state:
+            stopping.set_state(state["stopping"])
+        elif stopping:
+            stopping.start(best_value=elite.best_value)
+        if live_plot:
+            init_plot_multiprocess(live_plot=live_plot, q=evaluate.q, data=pop.as_points())
+    else:
+        # POPULATION INITIALISATION
+        pop, pop_size_log = initialise_algorithm(point_start=point_start, T_MAX=T_MAX,
+                                                 pop_f=pop_f, POP_MIN=POP_MIN, POP_MAX=POP_MAX,
+                                                 evaluate=evaluate, mutation=mutation, rng=rng,
+                                                 elite=elite, budget_log=budget_log, archive=archive,
+                                                 live_plot=live_plot)
+        t = 1
+        q_best_value, pop_size = None, None
+        if stopping:
+            stopping.start(best_value=elite.best_value)
+
     while True:
 
-        pop_size = pop_f(t, T_MAX, POP_MIN, POP_MAX, q=q_best_value, current_pop_size=pop_size)
+        with timer.phase("pop_f"):
+            pop_size = pop_f(t, T_MAX, POP_MIN, POP_MAX, q=q_best_value, current_pop_size=pop_size,
+                             stagnation=stagnation)
 
         # not allowing to use more than given destination function budget limit
-        if q_counter + pop_size > Q_MAX:
+        if evaluate.q_counter + pop_size > Q_MAX:
             break
 
         t += 1
-        q_best_value = numpy.inf
-        for i in range(pop_size):
-            new_point = mutation(select(pop))
-            q_value = q(new_point)
-            new_pop[new_point] = q_value
-            log[new_point] = q_value
-            q_counter += 1
+        # whole generation selected and mutated in one call
+        with timer.phase("select"):
+            parents = select(pop, pop_size, rng=rng)
+        with timer.phase("mutation"):
+            new_pop = Population(cords=mutation(parents, rng=rng))
+
+        # whole generation evaluated in one call
+        q_counter = evaluate.q_counter
+        with timer.phase("q"):
+            new_pop.values[:] = evaluate(new_pop.cords)
+
+        with timer.phase("logging"):
+            elite.update(new_pop)
+            if archive:
+                archive.add(new_pop)
 
             # remember best q_value in iteration for stagnation detection
-            if q_value < q_best_value:
-                q_best_value = q_value
+            q_best_value = float(numpy.min(new_pop.values))
 
-        # append best q value in history for ecdf graph
-        best_q_log.append((t-1, min(log.values())))
-        # append pop size for population plot
-        pop_size_log.append((t, pop_size))
+            # record best q value at budget checkpoints for ecdf graph
+            budget_log.record(new_pop.values, count=evaluate.last_charged)
+            # early termination rules
+            stop = stopping.update(new_pop.values, count=evaluate.last_charged) if stopping else None
+            # append pop size for population plot
+            pop_size_log.append((t, pop_size))
 
-        if live_plot:
-            live_plot.set_data(data=new_pop)
+            if live_plot:
+                live_plot.set_frame(numpy.column_stack([new_pop.cords[:, :2], new_pop.values]), generation=t - 1)
+        timer.end_generation(evaluate.q_counter - q_counter)
 
         pop = new_pop
-        new_pop = {}
+        if migration:
+            pop = migration.exchange(t - 1, pop)
+        if stop:
+            break
 
-    print(f"WYKORZYSTANY BUDŻET FUNKCJI CELU:{q_counter}\nLICZBA ITERACJI: {t - 1}")
+        if checkpoint and checkpoint.due():
+            checkpoint.save({"run": run, "t": t, "pop_size": pop_size, "q_best_value": q_best_value,
+                             "pop_cords": pop.cords, "pop_values": pop.values,
+                             "pop_size_log": numpy.array(pop_size_log, dtype=numpy.int64),
+                             "q_counter": evaluate.q_counter, "elite": elite.get_state(),
+                             "budget_log": budget_log.get_state(), "stagnation": stagnation.get_state(),
+                             "rng": rng.bit_generator.state,
+                             **({"stopping": stopping.get_state()} if stopping else {})})
+
+    timer.stop()
+    if checkpoint:
+        checkpoint.close()
+    if stopping:
+        stopping.finish()
+    print(f"WYKORZYSTANY BUDŻET FUNKCJI CELU:{evaluate.q_counter}\nLICZBA ITERACJI: {t - 1}")
     
-    return log, pop_size_log, best_q_log
+    budget_log.finish()
+    return elite, pop_size_log, budget_log, evaluate.q_counter
 
 
 # PLOTTING
-def init_plot_multiprocess(live_plot: DataVisualiser, q: Callable, data: dict or list):
+def init_plot_multiprocess(live_plot: DataVisualiser, q: Callable, data: list):
     x_limits = y_limits = (-100, 100)
     z_limits = calc_z_limits(q=q)
     return live_plot.init_plot_multiprocess(main_title="Wizualizacja",
@@ -128,12 +270,12 @@ def init_plot_multiprocess(live_plot: DataVisualiser, q: Callable, data: dict or
                                             z_limits=z_limits)
 
 
-def make_plot_log(plot_type, q: Callable, data: dict or list):
+def make_plot_log(plot_type, q: Callable, archive: Archive):
     x_limits = y_limits = (-100, 100)
     z_limits = calc_z_limits(q=q)
 
     return DataVisualiser(plot_type=plot_type).init_plot(main_title="Wizualizacja",
-                                                         data=data, data_color="red", data_size=1,
+                                                         data=archive.read().as_points(), data_color="red", data_size=1,
                                                          q_func=q, q_domain=x_limits, q_points=120,
                                                          q_alpha=0.2,
                                                          x_limits=x_limits, y_limits=y_limits,
@@ -150,32 +292,17 @@ def make_plot_pop(pop_size_log: list[tuple, tuple], pop_min, pop_max):
                                                                  try_connect_scatter=True)
 
 
-def make_plot_ecdf(best_q_log: list,
+def make_plot_ecdf(budget_log: BudgetLog,
                    _step_y: float, _from_y: float = None, _to_y: float = None,
                    _from_x: int = 0, _to_x: int = None):
-    x_limits = (_from_x, _to_x if _to_x else len(best_q_log))
-    _from_y = _from_y if _from_y else math.floor(min(best_q_log, key=lambda q: q[1])[1])
-    _to_y = _to_y if _to_y else math.ceil(max(best_q_log, key=lambda q: q[1])[1])
+    x_limits = (_from_x, _to_x if _to_x else budget_log.checkpoints[-1])
+    _from_y = _from_y if _from_y else math.floor(numpy.min(budget_log.values))
+    _to_y = _to_y if _to_y else math.ceil(numpy.max(budget_log.values))
     y_limits = (0, 1)
 
-    bounds = numpy.linspace(_from_y, _to_y, int((_to_y - _from_y) / _step_y))
-    target_count = len(bounds)
-
-    ecdf_log = []
     # generating data for ecdf
-    for (t, q) in best_q_log:
-        val = 0.0
-        if q <= bounds[0]:  # equal (or somehow better than) to minimum
-            val = 1.0
-        elif q > bounds[-1]:  # worse than the easiest target
-            val = 0.0
-        else:
-            for i, (u_bound, l_bound) in enumerate(zip(reversed(bounds[:]), reversed(bounds[:-1]))):
-                if u_bound >= q > l_bound:
-                    val = (i + 1) / target_count
-                    break
-
-        ecdf_log.append((t, val))
+    bounds = ecdf_targets(_from_y, _to_y, _step_y)
+    ecdf_log = list(zip(budget_log.checkpoints.tolist(), ecdf_values(budget_log.values, bounds).tolist()))
 
     return DataVisualiser(plot_type="2D").init_plot_multiprocess(main_title="Krzywa ECDF", data=ecdf_log,
                                                                  x_limits=x_limits, y_limits=y_limits,
@@ -183,33 +310,243 @@ def make_plot_ecdf(best_q_log: list,
                                                                  try_connect_scatter=True)
 
 
+# EXPERIMENTS
+def run_experiment(q_name: str, dimensions: int, pop_f_name: str, pop_min: int, pop_max: int, seed: int,
+                   live_plot: DataVisualiser = None, archive: Archive = None, profiler: PhaseTimer = None,
+                   q_max: int = None, migration: Migration = None, engine: Callable = None,
+                   checkpoint: Checkpointer = None, stopping: StoppingRules = None):
+    """
+    Single run of the algorithm (without saving results and plotting).
+    All randomness of the run comes from generators spawned from `seed` (see `spawn_rngs(...)`),
+    so the run can be reproduced by calling this function with the same arguments.
+    `q_max` - destination function budget (20000 if not given), `migration` - see `algorithm(...)`,
+    `engine` - function called instead of `algorithm(...)` with the same arguments (e.g. steady-state variant,
+    see `steady_state.steady_state_algorithm(...)`), `checkpoint`, `stopping` - see `algorithm(...)`.
+
+    Returns
+    -------
+    elite, pop_size_log, budget_log, q_used - as returned by `algorithm(...)`
+    t_max: int - number of iterations calculated for given population function
+    run_time: float - wall time of the algorithm [s]
+    """
+    # INIT CONST VALUES
+    _Q_MAX = q_max if q_max else 20000  # BUDŻET FUNKCJI CELU
+    _CACHE_SIZE = None  # number of points kept in objective function values cache (None - no cache)
+    _CACHE_COUNT_HITS = True  # whether cache hits are counted towards the budget
+    _SELECT_F_NAME = "tournament_selection_min"
+    _MUTATION_F_NAME = "gaussian_mutation"
+    _SELECT_PARAMS = {"s": 5}  # tournament size
+    _SELECT = partial(get_function.selection(function_name=_SELECT_F_NAME), **_SELECT_PARAMS)
+    _MUTATION_SIGMA = 1.0
+    _BOUNDS = (-100, 100)
+    _MUTATION = partial(get_function.mutation(function_name=_MUTATION_F_NAME), sigma=_MUTATION_SIGMA, bounds=_BOUNDS)
+    _START_CORD = 50
+    _POINT_START = tuple([_START_CORD for _ in range(dimensions)])
+    _Q_KEEP = 50  # number of previous q values checked by stagnation detection
+    _Q_TOL = 0.5  # stagnation tolerance
+
+    q = get_function.q(function_name=q_name, cache_size=_CACHE_SIZE, count_hits=_CACHE_COUNT_HITS)
+    pop_f = get_function.population(function_name=pop_f_name)
+
+    t_max = get_t_max(Q_MAX=_Q_MAX, pop_f=pop_f, POP_MIN=pop_min, POP_MAX=pop_max)
+    rng, _ = spawn_rngs(seed, 2)  # second generator is meant for the archive
+
+    run_time = time.perf_counter()
+    engine = engine if engine else algorithm
+    elite, pop_size_log, budget_log, q_used = engine(point_start=_POINT_START, T_MAX=t_max, Q_MAX=_Q_MAX,
+                                                pop_f=pop_f, POP_MIN=pop_min, POP_MAX=pop_max,
+                                                q=q, mutation=_MUTATION, select=_SELECT,
+                                                live_plot=live_plot, archive=archive,
+                                                rng=rng, stagnation=StagnationChecker(q_keep=_Q_KEEP, q_tol=_Q_TOL),
+                                                profiler=profiler, migration=migration, checkpoint=checkpoint,
+                                                stopping=stopping)
+    run_time = time.perf_counter() - run_time
+    return elite, pop_size_log, budget_log, q_used, t_max, run_time
+
+
+def stopping_rules(q_name: str, epsilon: float = None, no_improvement: int = None,
+                   wall_time: float = None) -> StoppingRules:
+    """
+    Stopping rules of a run on objective function `q_name`, target value is its known optimum + `epsilon`
+    (see `utils.stopping.StoppingRules`, `get_function.optimum(...)`).
+    """
+    target = None
+    if epsilon is not None:
+        q_optimum = get_function.optimum(function_name=q_name)
+        if q_optimum is None:
+            raise Exception(f"Optimum of objective function {q_name} is not known (or lies outside of the search "
+                            f"domain), target can not be set")
+        target = q_optimum + epsilon
+    return StoppingRules(target=target, no_improvement=no_improvement, wall_time=wall_time)
+
+
+def _sweep_run(q_name: str, dimensions: int, pop_f_name: str, pop_min: int, pop_max: int, seed: int,
+               profile: bool = False, checkpoint_file: str = None, checkpoint_interval: float = 60.0,
+               stopping: dict = None):
+    # executed in worker process - results are returned to the main process, which is the only one writing
+    # results files (worker writes only checkpoints of its own run)
+    profiler = PhaseTimer() if profile else None
+    checkpoint = Checkpointer(path=checkpoint_file, interval=checkpoint_interval) if checkpoint_file else None
+    rules = stopping_rules(q_name, **stopping) if stopping else None
+    elite, pop_size_log, budget_log, q_used, t_max, run_time = run_experiment(q_name=q_name, dimensions=dimensions,
+                                                                              pop_f_name=pop_f_name,
+                                                                              pop_min=pop_min, pop_max=pop_max,
+                                                                              seed=seed, profiler=profiler,
+                                                                              checkpoint=checkpoint, stopping=rules)
+    return elite.best_cords, elite.best_value, budget_log, pop_size_log, q_used, run_time, profiler, rules
+
+
+def run_runs(runs: list[tuple], pop_limits: dict = None, workers: int = None, base_seed: int = 0,
+             profile: bool = False, resume: bool = False, checkpoint_interval: float = 60.0,
+             stopping: dict = None) -> dict[tuple, float]:
+    """
+    Runs list of independent runs `(q_name, dims, pop_f_name, no)`, spreading them across `workers` processes.
+    Results are saved (by the main process only, as runs finish) with `save_to_ecdf_data(...)`
+    and then `save_to_data(...)`. Parameters are described in `run_sweep(...)`.
+
+    Returns
+    -------
+    best_values: dict - {(q_name, dims, pop_f_name, no): best value found in the run} (also of skipped runs)
+    """
+    pop_limits = pop_limits if pop_limits else {}
+    dirname = os.path.dirname(__file__)
+    best_values = {}
+    finished = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for q_name, dims, pop_f_name, no in runs:
+            pop_min, pop_max = pop_limits.get(pop_f_name, (1, 40))
+            seed = spawn_seed(base_seed, no)
+            if resume and (q_name, pop_f_name, dims) not in finished:
+                finished[(q_name, pop_f_name, dims)] = finished_runs(q_name, pop_f_name, dims)
+            checkpoint_file = checkpoint_path(q_name, pop_f_name, dims, no,
+                                              checkpoint_dir=os.path.join(dirname, "checkpoints"))
+            if resume and seed in finished[(q_name, pop_f_name, dims)]:
+                best_values[(q_name, dims, pop_f_name, no)] = finished[(q_name, pop_f_name, dims)][seed]
+                if os.path.exists(checkpoint_file):
+                    os.remove(checkpoint_file)  # left by a sweep stopped after the run was saved
+                continue
+            future = executor.submit(_sweep_run, q_name=q_name, dimensions=dims, pop_f_name=pop_f_name,
+                                     pop_min=pop_min, pop_max=pop_max, seed=seed, profile=profile,
+                                     checkpoint_file=checkpoint_file if resume else None,
+                                     checkpoint_interval=checkpoint_interval, stopping=stopping)
+            futures[future] = (q_name, dims, pop_f_name, no, seed, checkpoint_file)
+
+        for future in as_completed(futures):
+            q_name, dims, pop_f_name, no, seed, checkpoint_file = futures[future]
+            b_cords, b_value, budget_log, pop_size_log, q_used, run_time, profiler, rules = future.result()
+            # results record is saved last - it marks a complete run (skipped when the sweep is resumed)
+            save_to_ecdf_data(q_name, pop_f_name, dims, budget_log, no, seed, pop_size_log, rules)
+            if profiler:
+                save_to_profile_data(q_name, pop_f_name, dims, profiler, no, seed)
+            save_to_data(q_name, pop_f_name, dims, b_cords, b_value, seed, q_used, run_time)
+            if os.path.exists(checkpoint_file):
+                os.remove(checkpoint_file)  # run saved, its checkpoint is not needed any more
+            best_values[(q_name, dims, pop_f_name, no)] = b_value
+            stop = f" ({rules.reason}, {q_used} evaluations)" if rules else ""
+            print(f"[{q_name}, {dims}, {pop_f_name}, {no}] -> {b_value}{stop}")
+    return best_values
+
+
+def run_sweep(q_names: list[str], dimensions: list[int], pop_f_names: list[str], repeats: int = 25,
+              pop_limits: dict = None, workers: int = None, base_seed: int = 0, profile: bool = False,
+              resume: bool = False, checkpoint_interval: float = 60.0, stopping: dict = None):
+    """
+    Runs whole grid of experiments: q_names x dimensions x pop_f_names x repeats, spreading independent runs
+    across `workers` processes. Results are saved (by the main process only, as runs finish) with
+    `save_to_data(...)` and `save_to_ecdf_data(...)`.
+
+    Parameters
+    ----------
+    q_names: list of objective function names
+    dimensions: list of dimensions
+    pop_f_names: list of population function names
+    repeats: int - number of runs of each experiment
+    pop_limits: dict - {pop_f_name: (pop_min, pop_max)}, (1, 40) if pop_f_name not given
+    workers: int - number of worker processes, None means number of CPUs
+    base_seed: int - run `no` (counting from 1) is seeded with `spawn_seed(base_seed, no)`,
+                     so every run is reproducible regardless of the order in which runs are executed
+                     (seeds are saved next to results, single run can be repeated with `main(no, seed)`)
+    profile: bool - whether per-phase timing of every run is saved with `save_to_profile_data(...)`
+    resume: bool - whether runs already saved in results (recognised by seed) are skipped, and every run
+                   is checkpointed every `checkpoint_interval` seconds to `checkpoints/` (interrupted sweep
+                   started again with the same arguments continues unfinished runs from their checkpoints)
+    stopping: dict - early termination of runs, arguments of `stopping_rules(...)` (without q_name),
+                     e.g. {"epsilon": 1e-8, "no_improvement": 5000, "wall_time": 600}; stop reason and number
+                     of evaluations to target are saved with `save_to_ecdf_data(...)`
+    """
+    run_runs(list(itertools.product(q_names, dimensions, pop_f_names, range(1, repeats + 1))),
+             pop_limits=pop_limits, workers=workers, base_seed=base_seed, profile=profile, resume=resume,
+             checkpoint_interval=checkpoint_interval, stopping=stopping)
+
+
+def run_race(q_names: list[str], dimensions: list[int], pop_f_names: list[str], repeats: int = 25,
+             min_runs: int = 5, eta: int = 2, **sweep_params) -> dict[tuple, list[str]]:
+    """
+    Racing of population functions (successive halving) - like `run_sweep(...)`, but for every objective
+    function and dimension all population functions are run `min_runs` times first, then only the better
+    1 / `eta` of them (by median of best values, ties kept) go on with `eta` times more runs, and so on
+    until `repeats` runs. Clearly inferior population functions do not use computing time for all repeats.
+    Runs have the same seeds as in `run_sweep(...)`, so results of both can be mixed.
+
+    Parameters
+    ----------
+    min_runs: int - number of runs of every population function in the first round (at least 1)
+    eta: int - reduction factor of every round (at least 2)
+    sweep_params: other parameters of `run_sweep(...)` (pop_limits, workers, base_seed, resume, stopping, ...)
+
+    Returns
+    -------
+    survivors: dict - {(q_name, dims): population functions run `repeats` times, from the best one}
+    """
+    if eta < 2 or min_runs < 1:
+        # otherwise the number of runs would not grow or the field would not shrink - race would never end
+        raise ValueError(f"Racing requires eta >= 2 and min_runs >= 1, got: eta={eta}, min_runs={min_runs}")
+    alive = {(q_name, dims): list(pop_f_names) for q_name, dims in itertools.product(q_names, dimensions)}
+    best_values = {}
+    runs, done = min(min_runs, repeats), 0
+    while True:
+        # one round of all races run together, so that workers are kept busy
+        round_runs = [(q_name, dims, pop_f_name, no) for (q_name, dims), names in alive.items()
+                      for pop_f_name in names for no in range(done + 1, runs + 1)]
+        best_values.update(run_runs(round_runs, **sweep_params))
+        if runs >= repeats:
+            break
+        for (q_name, dims), names in alive.items():
+            scores = {name: float(numpy.median([best_values[(q_name, dims, name, no)] for no in range(1, runs + 1)]))
+                      for name in names}
+            limit = sorted(scores.values())[max(1, math.ceil(len(names) / eta)) - 1]
+            alive[(q_name, dims)] = sorted((name for name in names if scores[name] <= limit), key=scores.get)
+            dropped = [name for name in names if scores[name] > limit]
+            if dropped:
+                print(f"[{q_name}, {dims}] after {runs} runs dropped: {dropped}")
+        done, runs = runs, min(repeats, runs * eta)
+    return alive
+
+
 # MAIN
-def main(experiment_no=None):
+def main(experiment_no=None, seed=None):
     """
     plot parameters for q functions:
     f4 - optimum 400 -> x_limits = y_limits = (-100, 100), z_limits = (300, 600)
     f7 - optimum 700 -> x_limits = y_limits = (-100, 100), z_limits = (600, 900)
     ackley - optimum 0 -> x_limits = y_limits = (-100, 100), z_limits = (0, 30)
+    (the same z_limits for other built-in functions: rastrigin, rosenbrock, sphere, griewank, schwefel)
 
     z_limits automatically calculated in `calc_z_limits()` function
     """
+    seed = seed if seed is not None else new_seed()
 
     # INIT VARIABLES
     pop_min, pop_max = 1, 40  # to choose from (1, 40) or (5, 5) for constant
     dimensions = 2  # to choose from [2, 10, 20, 30, 50, 100]
-    q_name = "f7"  # to choose from ['f4', 'f7', 'ackley']
+    q_name = "f7"  # to choose from ['f4', 'f7', 'ackley'] or functions.objective_functions
     pop_f_name = "linear_increase"  # to choose from functions.population_functions
     q = get_function.q(function_name=q_name)
-    pop_f = get_function.population(function_name=pop_f_name)
-
-    # INIT CONST VALUES
-    _Q_MAX = 20000  # BUDŻET FUNKCJI CELU
-    _SELECT_F_NAME = "tournament_selection_min"
-    _MUTATION_F_NAME = "gaussian_mutation"
-    _SELECT = get_function.selection(function_name=_SELECT_F_NAME)
-    _MUTATION = get_function.mutation(function_name=_MUTATION_F_NAME)
-    _START_CORD = 50
-    _POINT_START = tuple([_START_CORD for _ in range(dimensions)])
+    _ARCHIVE_SIZE = 100000  # max number of points kept in memory by the archive
+    profile = False  # per-phase timing, evaluations/sec and peak memory saved to profile_data/
+    # early termination, e.g. stopping_rules(q_name, epsilon=1e-8, no_improvement=5000, wall_time=600)
+    stopping = None
 
     # PLOT SETTINGS
     live_plot = False
@@ -219,14 +556,31 @@ def main(experiment_no=None):
     plot_pop = False
     plot_ecdf = False
 
+    # ARCHIVE OF EVALUATED POINTS (needed only by `plot_log`)
+    # modes: 'off', 'last' (last N points), 'reservoir' (random sample of N points), 'stream' (all points to file)
+    archive_mode = "reservoir" if plot_log and not live_plot else "off"
+    archive = Archive(mode=archive_mode, size=_ARCHIVE_SIZE,
+                      path=os.path.join(os.path.dirname(__file__), "archive",
+                                        f"{q_name}_{pop_f_name}_{dimensions}_{experiment_no}.bin"),
+                      rng=spawn_rngs(seed, 2)[1])
+
+    profiler = PhaseTimer() if profile else None
+
     # PROPER ALGORITHM (WITH LIVE PLOT IF DEFINED)
     with DataVisualiser(plot_type="3D") if live_plot else nullcontext() as live_plot:
-        t_max = get_t_max(Q_MAX=_Q_MAX, pop_f=pop_f, POP_MIN=pop_min, POP_MAX=pop_max)
-
-        log, pop_size_log, best_q_log = algorithm(point_start=_POINT_START, T_MAX=t_max, Q_MAX=_Q_MAX,
-                                                  pop_f=pop_f, POP_MIN=pop_min, POP_MAX=pop_max,
-                                                  q=q, mutation=_MUTATION, select=_SELECT, live_plot=live_plot)
-        save_to_ecdf_data(pop_f_name, best_q_log, experiment_no)
+        elite, pop_size_log, budget_log, q_used, t_max, run_time = run_experiment(q_name=q_name,
+                                                                                  dimensions=dimensions,
+                                                                                  pop_f_name=pop_f_name,
+                                                                                  pop_min=pop_min, pop_max=pop_max,
+                                                                                  seed=seed, live_plot=live_plot,
+                                                                                  archive=archive,
+                                                                                  profiler=profiler,
+                                                                                  stopping=stopping)
+        archive.close()
+        save_to_data(q_name, pop_f_name, dimensions, elite.best_cords, elite.best_value, seed, q_used, run_time)
+        save_to_ecdf_data(q_name, pop_f_name, dimensions, budget_log, experiment_no, seed, pop_size_log, stopping)
+        if profiler:
+            save_to_profile_data(q_name, pop_f_name, dimensions, profiler, experiment_no, seed)
 
     # ADDITIONAL PLOTTING (IF LIVE PLOT NOT DEFINED)
     if not live_plot and (plot_log or plot_pop or plot_ecdf):
@@ -234,15 +588,21 @@ def main(experiment_no=None):
         if plot_pop:
             __plot_pop = make_plot_pop(pop_size_log=pop_size_log, pop_min=pop_min, pop_max=pop_max)
         if plot_ecdf:
-            __plot_ecdf = make_plot_ecdf(best_q_log=best_q_log, _step_y=1.0, _from_y=400.0, _to_y=430.0,
-                                         _from_x=0, _to_x=t_max)
+            __plot_ecdf = make_plot_ecdf(budget_log=budget_log, _step_y=1.0, _from_y=400.0, _to_y=430.0)
         if plot_log:
-            make_plot_log(plot_type="3D", q=q, data=log)
+            make_plot_log(plot_type="3D", q=q, archive=archive)
 
         __plot_pop.join() if __plot_pop else None
         __plot_ecdf.join() if __plot_ecdf else None
 
 
 if __name__ == "__main__":
-    for no in range(25):
-        main(no+1)
+    # single run with plotting (seed can be copied from results): main(experiment_no=1, seed=...)
+    # racing of population functions (successive halving): run_race(..., min_runs=5, eta=2)
+    run_sweep(q_names=["f7"],  # to choose from ['f4', 'f7', 'ackley'] or functions.objective_functions
+              dimensions=[2],  # to choose from [2, 10, 20, 30, 50, 100]
+              pop_f_names=["linear_increase"],  # to choose from functions.population_functions
+              repeats=25,
+              pop_limits={"const": (5, 5)},
+              workers=None,
+              resume=True)
@@ -1,38 +1,110 @@
+import argparse
 import os
-import statistics
+import re
+import time
+from inspect import getmembers, isfunction
+
+import numpy as np
+
+import functions.population_functions
+from utils.results import RESULTS_EXTENSION, load_results, results_path
+
+# file name pattern: {q_name}_{pop_f_name}_{dims}[_{variant}].res, e.g. f4_rect_wave_change_on_stagnation_20_q_tol_5.res
+# (population function is one of known ones - the longest matching, objective function name may contain '_')
+_FILENAME_PATTERNS = [re.compile(rf"^(?P<q_name>.+)_(?P<pop_f_name>{re.escape(name)})_(?P<dims>\d+)"
+                                 rf"(?:_(?P<variant>.+))?$")
+                      for name in sorted((name for name, member
+                                          in getmembers(functions.population_functions, predicate=isfunction)
+                                          if member.__module__ == functions.population_functions.__name__),
+                                         key=len, reverse=True)]
+COLUMNS = ("q_name", "dims", "pop_f_name", "runs", "min", "mean", "std", "median", "q25", "q75")
 
 
 def read_data(q_name, pop_f_name, dims):
     dirname = os.path.dirname(__file__)
-    filename = f"data/{q_name}_{pop_f_name}_{dims}.txt"
-    path_to_file = os.path.join(dirname, filename)
-    values = []
-    cords = []
-    with open(path_to_file, "r") as f:
-        for line in f.readlines():
-            line = line.strip("\n")
-            line = line.split("\t")
-            values.append(float(line[0]))
-            cords.append(eval(line[1]))
-    min_value = round(min(values), 3)
-    mean = round(statistics.mean(values), 3)
-    std_dev = round(statistics.stdev(values), 3)
+    path_to_file = results_path(q_name, pop_f_name, dims, data_dir=os.path.join(dirname, "data"))
+    values = load_results(path_to_file)["value"]
+    min_value = round(float(np.min(values)), 3)
+    mean = round(float(np.mean(values)), 3)
+    std_dev = round(float(np.std(values, ddof=1)), 3)
     return min_value, mean, std_dev
 
 
-q_name = "ackley"
-dimensions = 2
-# pop_f_name = "linear_increase"
-# pop_f_name = "linear_decrease"
-# pop_f_name = "exponential_increase"
-# pop_f_name = "exponential_decrease"
-# pop_f_name = "sin_wave_change"
-# pop_f_name = "rect_wave_change"
-pop_f_names = ["linear_increase", "linear_decrease", "exponential_increase", "exponential_decrease", "sin_wave_change", "rect_wave_change", "rect_wave_change_on_stagnation", "const"]
-for pop_name in pop_f_names:
-    print(pop_name + " = \t" + str(read_data(q_name, pop_name, dimensions)))
+def aggregate(data_dir: str = None, quantiles: tuple = (0.25, 0.75)) -> list[tuple]:
+    """
+    Scans `data_dir` once and computes statistics of best values of every experiment
+    (objective function x population function x dimension).
+    Values of all experiments are loaded into one (experiments x runs) matrix (NaN padded),
+    so every statistic is computed with a single NumPy call.
+
+    Returns
+    -------
+    rows: list of tuples (see `COLUMNS`), sorted by objective function, dimension and population function
+    """
+    data_dir = data_dir if data_dir else os.path.join(os.path.dirname(__file__), "data")
+    keys, experiments = [], []
+    for name in os.listdir(data_dir):
+        stem, extension = os.path.splitext(name)
+        if extension != RESULTS_EXTENSION:
+            continue
+        match = next((m for pattern in _FILENAME_PATTERNS if (m := pattern.match(stem))), None)
+        if not match:
+            print(f"Pominięto plik wyników o nieznanej nazwie: {name}")
+            continue
+        pop_f_name = match["pop_f_name"] + (f"_{match['variant']}" if match["variant"] else "")
+        keys.append((match["q_name"], int(match["dims"]), pop_f_name))
+        experiments.append(load_results(os.path.join(data_dir, name))["value"])
+    if not keys:
+        return []
+
+    values = np.full((len(experiments), max(len(v) for v in experiments)), np.nan)
+    for i, v in enumerate(experiments):
+        values[i, :len(v)] = v
+
+    runs = np.sum(~np.isnan(values), axis=1)
+    stats = [np.nanmin(values, axis=1), np.nanmean(values, axis=1), np.nanstd(values, axis=1, ddof=1),
+             np.nanmedian(values, axis=1), *np.nanquantile(values, quantiles, axis=1)]
+    rows = [(*key, int(n), *(float(s[i]) for s in stats)) for i, (key, n) in enumerate(zip(keys, runs))]
+    return sorted(rows, key=lambda row: row[:3])
+
+
+def to_csv(rows: list[tuple], path: str, decimals: int = 3):
+    with open(path, "w") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for row in rows:
+            f.write(",".join(__format_row(row, decimals)) + "\n")
+
+
+def to_latex(rows: list[tuple], path: str, decimals: int = 3):
+    with open(path, "w") as f:
+        f.write("\\begin{tabular}{lrl" + "r" * (len(COLUMNS) - 3) + "}\n\\hline\n")
+        f.write(" & ".join(c.replace("_", "\\_") for c in COLUMNS) + " \\\\\n\\hline\n")
+        for row in rows:
+            f.write(" & ".join(cell.replace("_", "\\_") for cell in __format_row(row, decimals)) + " \\\\\n")
+        f.write("\\hline\n\\end{tabular}\n")
+
+
+def __format_row(row: tuple, decimals: int) -> list[str]:
+    return [f"{cell:.{decimals}f}" if isinstance(cell, float) else str(cell) for cell in row]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistics of best values of all experiments in data directory")
+    parser.add_argument("--data-dir", default=None, help="directory with results files (default: data/)")
+    parser.add_argument("--csv", default=None, help="save table to CSV file")
+    parser.add_argument("--latex", default=None, help="save table to LaTeX file")
+    parser.add_argument("--decimals", type=int, default=3)
+    args = parser.parse_args()
 
-# print(read_data(q_name, pop_f_name, dimensions))
+    start = time.perf_counter()
+    table = aggregate(data_dir=args.data_dir)
+    if args.csv:
+        to_csv(table, args.csv, decimals=args.decimals)
+    if args.latex:
+        to_latex(table, args.latex, decimals=args.decimals)
 
-# wartosc minimalna, wartosc srednia, odchylenie standardowe
-# wstawic do tabeli
+    # wartosc minimalna, wartosc srednia, odchylenie standardowe, ...
+    print("\t".join(COLUMNS))
+    for table_row in table:
+        print("\t".join(__format_row(table_row, args.decimals)))
+    print(f"{len(table)} experiments in {time.perf_counter() - start:.3f} s")
@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from typing import Callable
+
+import numpy
+
+from functions.population_functions import StagnationChecker
+from main import new_seed, run_experiment
+from utils.archive import Archive
+from utils.budget_log import BudgetLog, log_checkpoints
+from utils.elite import EliteTracker
+from utils.population import Population
+from utils.stopping import StoppingRules
+
+
+def steady_state_algorithm(point_start: tuple, T_MAX: int, Q_MAX: int, pop_f: Callable, POP_MIN: int, POP_MAX: int,
+                           q: Callable, mutation: Callable, select: Callable,
+                           live_plot=None, rng: numpy.random.Generator = None, archive: Archive = None,
+                           elite_k: int = 1, stagnation: StagnationChecker = None, checkpoints: numpy.ndarray = None,
+                           profiler=None, migration=None, checkpoint=None, stopping: StoppingRules = None,
+                           workers: int = None, chunk: int = 1):
+    """
+    Asynchronous steady-state variant of `main.algorithm(...)` (accepts the same arguments).
+    Objective function is evaluated by a pool of `workers` processes, every worker is kept busy with candidates
+    (`chunk` mutated points per task). Every evaluated candidate is inserted into the population as soon as
+    it returns, and the worst individuals are removed when population exceeds its target size.
+    Target population size follows `pop_f` over evaluation count: virtual generation `t` ends every time
+    as many evaluations as the current target size have been completed (so T_MAX calculated by `get_t_max(...)`
+    applies). Whole budget `Q_MAX` is used, unless `stopping` rules end the run earlier (checked after every
+    completed task, tasks already submitted are still evaluated and counted).
+    Order of completed evaluations depends on timing of workers, so runs are not exactly reproducible.
+    Pays off only for expensive objective functions - every task costs inter-process communication
+    (use bigger `chunk` for cheaper ones).
+
+    Returns
+    -------
+    elite, pop_size_log, budget_log, q_counter - as `main.algorithm(...)`
+    """
+    if live_plot or profiler or migration or checkpoint:
+        raise Exception("Live plot, profiling, migration and checkpoints are not supported in steady-state mode")
+    rng = rng if rng else numpy.random.default_rng()
+    elite = EliteTracker(k=elite_k)
+    budget_log = BudgetLog(checkpoints=checkpoints if checkpoints is not None else log_checkpoints(Q_MAX))
+    stagnation = stagnation if stagnation else StagnationChecker()
+    workers = workers if workers else os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # POPULATION INITIALISATION (not counted towards the budget)
+        point_start = numpy.asarray(point_start, dtype=numpy.float64)
+        pop_size = pop_f(0, T_MAX, POP_MIN, POP_MAX)
+        initial = Population(cords=numpy.vstack([point_start,
+                                                 mutation(numpy.tile(point_start, (pop_size, 1)), rng=rng)]))
+        batches = numpy.array_split(initial.cords, min(workers, len(initial)))
+        initial.values[:] = numpy.concatenate([numpy.reshape(values, -1) for values in executor.map(q, batches)])
+        elite.update(initial)
+        budget_log.record(initial.values, count=False)
+        if archive:
+            archive.add(initial)
+        pop = Population(cords=initial.cords[1:], values=initial.values[1:])
+        pop_size_log = [(0, pop_size)]
+        if stopping:
+            stopping.start(best_value=elite.best_value)
+
+        t = 1
+        pop_size = pop_f(t, T_MAX, POP_MIN, POP_MAX, q=None, current_pop_size=pop_size, stagnation=stagnation)
+        q_counter, submitted = 0, 0
+        completed, generation_best = 0, numpy.inf     # evaluations completed in current virtual generation
+        pending = {}
+        while True:
+            # keep every worker busy (with one task waiting in the queue)
+            while len(pending) < 2 * workers and submitted < Q_MAX and not (stopping and stopping.reason):
+                n = min(chunk, Q_MAX - submitted)
+                candidates = mutation(select(pop, n, rng=rng), rng=rng)
+                pending[executor.submit(q, candidates)] = candidates
+                submitted += n
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                new = Population(cords=pending.pop(future), values=numpy.reshape(future.result(), -1))
+                q_counter += len(new)
+                elite.update(new)
+                budget_log.record(new.values)
+                if stopping:
+                    stopping.update(new.values)
+                if archive:
+                    archive.add(new)
+                generation_best = min(generation_best, float(numpy.min(new.values)))
+                completed += len(new)
+
+                # inserted immediately, the worst individuals removed
+                pop = Population.concatenate([pop, new])
+                if completed >= pop_size:
+                    t += 1
+                    completed -= pop_size
+                    pop_size = pop_f(t, T_MAX, POP_MIN, POP_MAX, q=generation_best, current_pop_size=pop_size,
+                                     stagnation=stagnation)
+                    generation_best = numpy.inf
+                    pop_size_log.append((t, pop_size))
+                if len(pop) > pop_size:
+                    keep = numpy.argsort(pop.values, kind="stable")[:pop_size]
+                    pop = Population(cords=pop.cords[keep], values=pop.values[keep])
+
+    if stopping:
+        stopping.finish()
+    print(f"WYKORZYSTANY BUDŻET FUNKCJI CELU:{q_counter}\nLICZBA ITERACJI: {t - 1}")
+
+    budget_log.finish()
+    return elite, pop_size_log, budget_log, q_counter
+
+
+def run_steady_state(q_name: str, dimensions: int, pop_f_name: str, pop_min: int, pop_max: int, seed: int = None,
+                     workers: int = None, chunk: int = 1, q_max: int = None):
+    """
+    Single run of the steady-state variant with the same settings as `main.run_experiment(...)`.
+    Objective function `q_name` must be picklable (all CEC2017 and built-in functions are).
+
+    Returns
+    -------
+    elite, pop_size_log, budget_log, q_used, t_max, run_time - as `main.run_experiment(...)`
+    """
+    seed = seed if seed is not None else new_seed()
+    return run_experiment(q_name=q_name, dimensions=dimensions, pop_f_name=pop_f_name,
+                          pop_min=pop_min, pop_max=pop_max, seed=seed, q_max=q_max,
+                          engine=partial(steady_state_algorithm, workers=workers, chunk=chunk))
+
+
+if __name__ == "__main__":
+    elite, pop_size_log, budget_log, q_used, t_max, run_time = run_steady_state(q_name="f7", dimensions=10,
+                                                                                pop_f_name="linear_increase",
+                                                                                pop_min=1, pop_max=40,
+                                                                                workers=None, chunk=1)
+    print(f"NAJLEPSZA WARTOŚĆ: {elite.best_value}, CZAS: {run_time:.2f} s")
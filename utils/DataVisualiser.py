@@ -1,12 +1,15 @@
 import multiprocessing
+import os
+import tempfile
 import threading
-import time
 import typing
 
 import numpy as np
 from matplotlib import animation
 import matplotlib.pyplot as plt
 
+from utils.live_buffer import FrameBuffer
+
 
 
 class DataVisualiser:
@@ -14,19 +17,21 @@ class DataVisualiser:
     fig = None
     ax = None
     scatter = None
-    x_axis, x_axis_temp = [], []
-    y_axis, y_axis_temp = [], []
-    z_axis, z_axis_temp = [], []
+    x_axis = []
+    y_axis = []
+    z_axis = []
 
     # live plot components
     __anim: animation.FuncAnimation = None
     __process = None
-    __process_started = threading.Event()
+    __process_started: threading.Event = None
     __multiprocess = False
     __manager: multiprocessing.Manager = None
     __queue: multiprocessing.Queue = None
-    __big_queue: multiprocessing.Queue = None
-    __finished: threading.Event = threading.Event()
+    __frames: FrameBuffer = None     # shared memory frames set by `set_data(...)` / `set_frame(...)`
+    __last_frame_id = -1
+    __data_version, __drawn_version = 0, 0   # to redraw only when data changed
+    __finished: threading.Event = None
     __anim_sample_time = None
     __data_sample_time = None
 
@@ -49,6 +54,9 @@ class DataVisualiser:
         self.plot_type = plot_type
         self.try_connect_scatter = False
         self.q_func = None
+        self.x_axis, self.y_axis, self.z_axis = [], [], []
+        self.__process_started = threading.Event()
+        self.__finished = threading.Event()
 
         if plot_type == "2D":
             self.projection = None  # plot mode (2D/3D)
@@ -111,10 +119,12 @@ class DataVisualiser:
         plt.show()
         return self
 
-    def init_plot_multiprocess(self, anim_sample_time: float = 0.01, data_sample_time: float or None = 0.01, **kwargs):
+    def init_plot_multiprocess(self, anim_sample_time: float = 0.01, data_sample_time: float or None = 0.01,
+                               frame_capacity: int = 10000, **kwargs):
         """
         Init matplotlib scatter plot (with optional pre-inserted data) in separate process.
-        This allows user to later add new points to plot dynamically using `add_to_plot(...)` method.
+        This allows user to later add new points to plot dynamically using `add_to_plot(...)` method
+        or replace them using `set_data(...)` / `set_frame(...)` methods.
         Keyword parameters are passed to `init_plot(...)` method!
 
         Parameters
@@ -123,6 +133,8 @@ class DataVisualiser:
             Sample time of animation.
         data_sample_time : float
             Sample time of checking multiprocess queue, None means instant.
+        frame_capacity : int
+            Maximum number of points of data set by `set_data(...)` / `set_frame(...)`.
 
         Returns
         -------
@@ -143,7 +155,6 @@ class DataVisualiser:
             """
             with multiprocessing.Manager() as manager:
                 self.__queue = manager.Queue()
-                self.__big_queue = manager.Queue()
                 self.__process = multiprocessing.Process(target=self.init_plot, kwargs={**kwargs})
                 self.__process.start()  # starting process with multiprocess manager -> its joinable!
                 self.__process_started.set()
@@ -151,8 +162,9 @@ class DataVisualiser:
 
         self.__data_sample_time = data_sample_time
         self.__anim_sample_time = anim_sample_time
+        self.__frames = FrameBuffer(capacity=frame_capacity)  # created before plot process, attached by its name
         threading.Thread(target=__init__multiprocess, daemon=False).start()
-        time.sleep(2.0)
+        self.__process_started.wait()
         self.__multiprocess = True
         return self
 
@@ -186,9 +198,40 @@ class DataVisualiser:
             For 3D plotting, use list of 3D tuples or dict[(float, float) : float] for respecively x,y,z axis data.
             Plot initialised as 2D/3D raises an expception if `data` arg is (opposite) 3D/2D data.
         """
-        if self.__process:
-            self.__queue.put("__set_data")  # signal to check big queue
-            self.__big_queue.put(data)
+        if self.__frames:
+            self.__verify_data_type(data)
+            if isinstance(data, dict):
+                points = np.array([(*data_point[:2], value) for data_point, value in data.items()])
+            else:
+                points = np.array(data)
+            self.set_frame(points)
+
+    def set_data_color(self, c: str = "red"):
+        """
+        Sets color of future data.
+
+        Parameters
+        ----------
+        c: color value in format accepted by matplotlib
+        """
+        self.data_color = c
+
+    def set_frame(self, points: np.ndarray, generation: int = 0):
+        """
+        Sets new data for the plot - fast version of `set_data(...)`, taking array of points of shape (N, 2) or (N, 3).
+        Points are written to shared memory ring buffer without blocking, if plot process falls behind,
+        older frames are dropped. If plot was not initialised (as multiprocess), this method will do nothing.
+
+        Parameters
+        ----------
+        points : array of shape (N, 2) for 2D plot or (N, 3) for 3D plot (x, y, z)
+        generation : int - number of algorithm iteration, shown in plot title
+        """
+        if self.__frames:
+            points = np.asarray(points, dtype=np.float64)
+            if points.shape[1] == 2:
+                points = np.column_stack([points, np.full(len(points), np.nan)])
+            self.__frames.write(points, generation=generation)
 
     def join(self):
         """
@@ -202,21 +245,24 @@ class DataVisualiser:
         if self.__process:
             self.__process.join()
             self.__finished.set()
-
-
-    def set_data_color(self, c: str = "red"):
-        """
-        Sets color of future data.
-
-        Parameters
-        ----------
-        c: color value in format accepted by matplotlib
-        """
-        self.data_color = c
+        if self.__frames:
+            self.__frames.close(unlink=True)
+            self.__frames = None
 
     def __enter__(self):
         return self
 
+    def __getstate__(self) -> dict:
+        # events of this process are not passed to the plot process (started by 'spawn' or 'forkserver')
+        state = self.__dict__.copy()
+        del state["_DataVisualiser__process_started"], state["_DataVisualiser__finished"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.__process_started = threading.Event()
+        self.__finished = threading.Event()
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.join()
 
@@ -229,16 +275,7 @@ class DataVisualiser:
         if not self.ax:
             raise Exception("Plot not initialised!")
 
-        xys = np.linspace(domain[0], domain[1], points)
-        xys = np.transpose([np.tile(xys, len(xys)), np.repeat(xys, len(xys))])
-        zs = np.zeros(points * points)
-
-        for i in range(0, xys.shape[0]):
-            zs[i] = function(xys[i])
-        x = xys[:, 0].reshape((points, points))
-        y = xys[:, 1].reshape((points, points))
-        z = zs.reshape((points, points))
-
+        x, y, z = surface_grid(function=function, domain=domain, points=points)
         self.ax.plot_surface(x, y, z, cmap='gist_ncar', edgecolor='none', alpha=alpha)
 
     def __verify_data_type(self, data: (list[tuple[float, float]] or list[tuple[float, float, float]] or
@@ -291,30 +328,22 @@ class DataVisualiser:
             data = self.__queue.get()
             if not data:
                 break
-            elif data == "__set_data":
-                big_data = self.__big_queue.get()
-                self.__set_data(big_data)
-            else:
-                self.__add_to_data(data)
+            self.__add_to_data(data)
             if self.__data_sample_time:
                 self.__finished.wait(self.__data_sample_time)
         plt.close()
         return
 
-    def __set_data(self, data: (list[tuple[float, float]] or list[tuple[float, float, float]] or
-                                dict[tuple[float, float], float] or None)):
-        self.__verify_data_type(data)
-        x_axis, y_axis, z_axis = [], [], []
-        for data_point in data:
-            if len(data_point) == 3:
-                z_axis.append(data_point[2])
-            else:
-                if isinstance(data, dict):
-                    z_axis.append(data[data_point])
-
-            x_axis.append(data_point[0])
-            y_axis.append(data_point[1])
-        self.x_axis, self.y_axis, self.z_axis = x_axis, y_axis, z_axis
+    def __read_frame(self):
+        frame = self.__frames.read(self.__last_frame_id) if self.__frames else None
+        if frame is None:
+            return
+        self.__last_frame_id, generation, points = frame
+        # lists, so that points added later by `add_point(...)` are appended
+        self.x_axis, self.y_axis = points[:, 0].tolist(), points[:, 1].tolist()
+        self.z_axis = points[:, 2].tolist() if self.plot_type == "3D" else []
+        self.fig.suptitle(f"{self.main_title} (t = {generation})", fontsize=14)
+        self.__data_version += 1
 
     def __add_to_data(self, data_point: tuple[float, float] or tuple[float, float, float]):
         self.__verify_datapoint_type(data_point)
@@ -323,23 +352,29 @@ class DataVisualiser:
         self.y_axis.append(data_point[1])
         if len(data_point) == 3:
             self.z_axis.append(data_point[2])
+        self.__data_version += 1
 
     def __init_live_plot(self):
         if self.__process:
             self.__finished = threading.Event()
-            self.__anim = animation.FuncAnimation(self.fig, self.__live_plot, blit=True,
+            self.__anim = animation.FuncAnimation(self.fig, self.__live_plot, blit=True, cache_frame_data=False,
                                                   interval=self.__anim_sample_time * 1000)
             thread = threading.Thread(target=self.__queue_handler, daemon=True)
             thread.start()
 
     def __live_plot(self, frame=None):
-        if self.x_axis_temp != self.x_axis or self.y_axis_temp != self.y_axis or self.z_axis_temp != self.z_axis:
-            if self.z_axis:
-                self.scatter = self.ax.scatter(self.x_axis, self.y_axis, self.z_axis, c=self.data_color, s=self.data_size)
+        self.__read_frame()
+        if self.__drawn_version != self.__data_version:
+            # updating existing scatter instead of creating new one every frame
+            if self.scatter is None:
+                self.scatter = self.ax.scatter([], [], [], c=self.data_color, s=self.data_size) \
+                    if self.plot_type == "3D" else self.ax.scatter([], [], c=self.data_color, s=self.data_size)
+            if self.plot_type == "3D":
+                self.scatter._offsets3d = (np.asarray(self.x_axis), np.asarray(self.y_axis), np.asarray(self.z_axis))
             else:
-                self.scatter = self.ax.scatter(self.x_axis, self.y_axis, c=self.data_color, s=self.data_size)
+                self.scatter.set_offsets(np.column_stack([self.x_axis, self.y_axis]))
             self.fig.canvas.draw()
-            self.x_axis_temp, self.y_axis_temp, self.z_axis_temp = self.x_axis, self.y_axis, self.z_axis
+            self.__drawn_version = self.__data_version
 
         return self.scatter,
 
@@ -348,5 +383,44 @@ class DataVisualiser:
             self.__finished.set()
 
 
+# surface grids of objective functions are cached on disk (keyed by function name, domain and resolution)
+SURFACE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", ".cache", "surfaces")
+
+
+def surface_grid(function: typing.Callable, domain=(-100, 100), points=30, cache_dir: str or None = SURFACE_CACHE_DIR):
+    """
+    Values of 2D function on (points x points) grid over domain x domain, computed with a single batched call
+    of `function` (matrix of shape (points * points, 2) -> vector) and cached on disk in `cache_dir` (None - no cache).
+
+    Returns
+    -------
+    x, y, z : arrays of shape (points, points)
+    """
+    path = None
+    if cache_dir:
+        path = os.path.join(cache_dir, f"{function.__name__}_{domain[0]}_{domain[1]}_{points}.npy")
+        if os.path.exists(path):
+            x, y, z = np.load(path)
+            return x, y, z
+
+    xys = np.linspace(domain[0], domain[1], points)
+    xys = np.transpose([np.tile(xys, len(xys)), np.repeat(xys, len(xys))])
+    zs = np.asarray(function(xys), dtype=np.float64).reshape(points * points)
+
+    x = xys[:, 0].reshape((points, points))
+    y = xys[:, 1].reshape((points, points))
+    z = zs.reshape((points, points))
+
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # unique temporary file replaced atomically - plots opened in parallel never read (nor write) the same
+        # half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.stack([x, y, z]))
+        os.replace(tmp_path, path)
+    return x, y, z
+
+
 if __name__ == "__main__":
     pass
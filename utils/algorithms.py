@@ -1,30 +1,25 @@
-import heapq
+import json
+import os
+import tempfile
+from functools import lru_cache
 from math import ceil
 
-from scipy import integrate
-from scipy.optimize import fsolve
 
-
-def max_value_points_from_dictionary(points_dict: dict, number_of_best: int):
-    return heapq.nlargest(number_of_best, points_dict, key=lambda x: points_dict[x])
-
-
-def min_value_points_from_dictionary(points_dict: dict, number_of_best: int):
-    return heapq.nsmallest(number_of_best, points_dict, key=lambda x: points_dict[x])
-
-
-def get_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX):
+def get_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX, cache_file: str = None):
     """
     Function to get number of iterations (T_MAX) depending on given destination function budget limit (Q_MAX)
     and chosen population function (pop_f).
-    Solves an equation:
-                        ∫ [0 -> T_MAX] { pop_f(t) dt } = Q_MAX    -----     T_MAX = ?
+    Solves (exactly, in the same discrete way as `algorithm(...)` uses the budget) an equation:
+                        Σ [t = 1 -> T_MAX] { pop_f(t, T_MAX) } >= Q_MAX    -----     min T_MAX = ?
+    Results are memoized (keyed by parameters) and optionally saved to / read from json file `cache_file`.
+
     Parameters
     ----------
     Q_MAX: int - destination function budget limit
     pop_f: func - population function
     POP_MIN: int - minimum population (pop_f parameter)
     POP_MAX: int - max population (pop_f parameter)
+    cache_file: str - path to json file with previously calculated values, optional
 
     Returns
     -------
@@ -35,12 +30,53 @@ def get_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX):
     if pop_f.__name__ in ("sin_wave_change", "rect_wave_change_on_stagnation"):
         return None
 
-    def integrand(t, T_MAX):
-        return pop_f(t, T_MAX, POP_MIN, POP_MAX)
+    if not cache_file:
+        return __solve_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX)
+
+    key = f"{pop_f.__name__}|{Q_MAX}|{POP_MIN}|{POP_MAX}"
+    cache = __read_cache(cache_file)
+    if key in cache:
+        return cache[key]
+
+    t_max = __solve_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX)
+    # file is read again just before writing to keep values saved meanwhile by other processes, written to a unique
+    # temporary file replaced atomically (file is never left half-written); value saved concurrently by another
+    # process can still be lost, it is then only calculated again
+    cache = {**__read_cache(cache_file), key: t_max}
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f, indent=4)
+    os.replace(tmp_path, cache_file)
+    return t_max
+
+
+def budget_used(T_MAX, pop_f, POP_MIN, POP_MAX):
+    """
+    Destination function budget used by `T_MAX` iterations of the algorithm.
+    """
+    return sum(pop_f(t, T_MAX, POP_MIN, POP_MAX) for t in range(1, T_MAX + 1))
+
+
+def __read_cache(cache_file: str) -> dict:
+    if not os.path.exists(cache_file):
+        return {}
+    with open(cache_file, "r") as f:
+        return json.load(f)
+
 
-    def func(T_MAX):
-        y, err = integrate.quad(func=integrand, a=1, b=T_MAX, args=(T_MAX,), limit=1000)
-        return y - Q_MAX
+@lru_cache(maxsize=None)
+def __solve_t_max(Q_MAX, pop_f, POP_MIN, POP_MAX):
+    # every iteration uses between POP_MIN and POP_MAX evaluations
+    lo = max(1, ceil(Q_MAX / POP_MAX))
+    hi = max(lo, ceil(Q_MAX / max(POP_MIN, 1)))
 
-    sol = fsolve(func, Q_MAX/POP_MAX)
-    return ceil(sol[0]) if sol else None
+    # binary search for the smallest T_MAX using whole budget (budget used grows with T_MAX)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if budget_used(mid, pop_f, POP_MIN, POP_MAX) >= Q_MAX:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
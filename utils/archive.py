@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+
+from utils.population import Population
+
+
+class Archive:
+    MODES = ("off", "last", "reservoir", "stream")
+    __HEADER_DTYPE = np.dtype("<i8")    # stream file header: number of dimensions
+    __RECORD_DTYPE = np.dtype("<f8")    # stream file record: (value, *cords)
+
+    def __init__(self, mode: str = "off", size: int = 100000, path: str = None, chunk_size: int = 4096,
+                 rng: np.random.Generator = None):
+        """
+        Opt-in archive of evaluated points with bounded memory usage.
+
+        Parameters
+        ----------
+        mode : str
+            'off' - nothing is stored,
+            'last' - only `size` most recently evaluated points are kept (ring buffer),
+            'reservoir' - uniform random sample of `size` points out of all evaluated ones (reservoir sampling),
+            'stream' - all points are appended to binary file `path` in chunks of `chunk_size` points.
+        size : int
+            Maximum number of points kept in memory ('last' and 'reservoir' modes).
+        path : str
+            Path to binary file ('stream' mode), overwritten if exists.
+        chunk_size : int
+            Number of points buffered in memory before being written to file ('stream' mode).
+        rng : numpy.random.Generator
+            Random generator used by reservoir sampling.
+        """
+        if mode not in self.MODES:
+            raise Exception(f"Unknown archive mode: [{mode}], choose from {self.MODES}")
+        if mode == "stream" and not path:
+            raise Exception("Archive in 'stream' mode requires `path`")
+
+        self.mode = mode
+        self.size = size if mode != "stream" else chunk_size
+        self.path = path
+        self.rng = rng if rng else np.random.default_rng()
+        self.seen = 0               # number of points added to the archive so far
+
+        self.__cords = None         # buffers preallocated on first `add(...)`, when dimension is known
+        self.__values = None
+        self.__filled = 0           # number of valid rows in buffers
+
+    def add(self, population: Population):
+        """
+        Adds newly evaluated points to the archive.
+        """
+        if self.mode == "off" or not len(population):
+            return
+        if self.__cords is None:
+            self.__allocate(population.dims)
+
+        if self.mode == "last":
+            self.__add_last(population)
+        elif self.mode == "reservoir":
+            self.__add_reservoir(population)
+        elif self.mode == "stream":
+            self.__add_stream(population)
+        self.seen += len(population)
+
+    def read(self) -> Population:
+        """
+        Reads back archived points (for 'stream' mode - all points written to file so far).
+        """
+        if self.__cords is None:
+            return Population(cords=np.empty((0, 0)))
+
+        if self.mode == "stream":
+            self.flush()
+            return self.read_file(self.path)
+
+        return Population(cords=self.__cords[:self.__filled].copy(), values=self.__values[:self.__filled].copy())
+
+    @classmethod
+    def read_file(cls, path: str) -> Population:
+        """
+        Reads all points from file written by archive in 'stream' mode.
+        """
+        dims = int(np.fromfile(path, dtype=cls.__HEADER_DTYPE, count=1)[0])
+        records = np.fromfile(path, dtype=cls.__RECORD_DTYPE, offset=cls.__HEADER_DTYPE.itemsize).reshape(-1, dims + 1)
+        return Population(cords=records[:, 1:], values=records[:, 0])
+
+    def flush(self):
+        """
+        Writes buffered points to file ('stream' mode only).
+        """
+        if self.mode != "stream" or not self.__filled:
+            return
+        records = np.column_stack([self.__values[:self.__filled], self.__cords[:self.__filled]])
+        with open(self.path, "ab") as f:
+            records.astype(self.__RECORD_DTYPE, copy=False).tofile(f)
+        self.__filled = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # PRIVATE METHODS
+    def __allocate(self, dims: int):
+        self.__cords = np.empty((self.size, dims))
+        self.__values = np.empty(self.size)
+        if self.mode == "stream":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "wb") as f:
+                np.array([dims], dtype=self.__HEADER_DTYPE).tofile(f)
+
+    def __add_last(self, population: Population):
+        # only last `size` points of the batch can survive
+        cords, values = population.cords[-self.size:], population.values[-self.size:]
+        slots = (self.seen + len(population) - len(values) + np.arange(len(values))) % self.size
+        self.__cords[slots] = cords
+        self.__values[slots] = values
+        self.__filled = min(self.size, self.__filled + len(population))
+
+    def __add_reservoir(self, population: Population):
+        cords, values = population.cords, population.values
+
+        # filling reservoir until full
+        free = min(self.size - self.__filled, len(values))
+        self.__cords[self.__filled:self.__filled + free] = cords[:free]
+        self.__values[self.__filled:self.__filled + free] = values[:free]
+        self.__filled += free
+
+        # i-th point (counting from 0) replaces random slot with probability size / (i + 1)
+        indices = self.seen + np.arange(free, len(values))
+        if len(indices):
+            slots = self.rng.integers(0, indices + 1)
+            chosen = slots < self.size
+            self.__cords[slots[chosen]] = cords[free:][chosen]
+            self.__values[slots[chosen]] = values[free:][chosen]
+
+    def __add_stream(self, population: Population):
+        cords, values = population.cords, population.values
+        start = 0
+        while start < len(values):
+            n = min(self.size - self.__filled, len(values) - start)
+            self.__cords[self.__filled:self.__filled + n] = cords[start:start + n]
+            self.__values[self.__filled:self.__filled + n] = values[start:start + n]
+            self.__filled += n
+            start += n
+            if self.__filled == self.size:
+                self.flush()
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def log_checkpoints(Q_MAX: int, points: int = 200) -> np.ndarray:
+    """
+    Logarithmically spaced destination function budget checkpoints from 1 to Q_MAX (at most `points` of them).
+    """
+    return np.unique(np.round(np.logspace(0, np.log10(Q_MAX), points)).astype(np.int64))
+
+
+class BudgetLog:
+
+    def __init__(self, checkpoints: np.ndarray):
+        """
+        Best-so-far value recorded at fixed numbers of used destination function evaluations (checkpoints),
+        so that logs of runs with different population sizes line up without resampling.
+        Values are stored in preallocated array of the same length as `checkpoints`.
+
+        Parameters
+        ----------
+        checkpoints : array of increasing ints - numbers of evaluations (see `log_checkpoints(...)`)
+        """
+        self.checkpoints = np.asarray(checkpoints, dtype=np.int64)
+        self.values = np.full(len(self.checkpoints), np.nan)
+        self.q_counter = 0
+        self.best_value = np.inf
+        self.__next = 0     # index of the first checkpoint not reached yet
+
+    def record(self, values: np.ndarray, count: bool or np.ndarray = True):
+        """
+        Records values of newly evaluated points (in order of evaluation).
+        Points not counted towards the budget (`count=False` or False in `count` mask, e.g. initial population
+        or cache hits) only update best value.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        charged = np.broadcast_to(np.asarray(count, dtype=bool), values.shape)
+        if charged.any():
+            q_before = self.q_counter
+            q_after = q_before + np.cumsum(charged)     # used budget after every single evaluation of this batch
+            self.q_counter = int(q_after[-1])
+            end = int(np.searchsorted(self.checkpoints, self.q_counter, side="right"))
+            if end > self.__next:
+                # best value after every single evaluation of this batch
+                running = np.minimum(np.minimum.accumulate(values), self.best_value)
+                last = np.searchsorted(q_after, self.checkpoints[self.__next:end], side="right") - 1
+                self.values[self.__next:end] = running[last]
+                self.__next = end
+        self.best_value = min(self.best_value, float(np.min(values)))
+
+    def get_state(self) -> dict:
+        # for checkpoints (see `utils.checkpoint.Checkpointer`)
+        return {"checkpoints": self.checkpoints, "values": self.values, "q_counter": self.q_counter,
+                "best_value": self.best_value, "next": self.__next}
+
+    def set_state(self, state: dict):
+        self.checkpoints = np.asarray(state["checkpoints"], dtype=np.int64)
+        self.values = np.array(state["values"], dtype=np.float64)
+        self.q_counter = state["q_counter"]
+        self.best_value = state["best_value"]
+        self.__next = state["next"]
+
+    def finish(self):
+        """
+        Fills checkpoints not reached (budget not fully used) with final best value.
+        """
+        self.values[self.__next:] = self.best_value
+        self.__next = len(self.checkpoints)
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_EXTENSION = ".ckpt.npz"
+
+
+class Checkpointer:
+
+    def __init__(self, path: str, interval: float = 60.0):
+        """
+        Periodic checkpoints of a run of the algorithm, saved to `path` (.npz file).
+        State is copied (snapshot) in the main thread and written to file by a background thread, atomically
+        (temporary file replaced in one step), so the file always holds complete previous or new checkpoint.
+        Checkpoint is skipped if the previous one is still being written - main loop is never blocked by disk.
+
+        Parameters
+        ----------
+        path : str
+            Checkpoint file (resumed from, if exists).
+        interval : float
+            Minimal time between checkpoints [s] (0 - after every generation).
+        """
+        self.path = path
+        self.interval = interval
+        self.__last = time.monotonic()
+        self.__writer = ThreadPoolExecutor(max_workers=1)
+        self.__pending = None
+
+    def due(self) -> bool:
+        return time.monotonic() - self.__last >= self.interval
+
+    def save(self, state: dict):
+        """
+        Saves `state` - nested dict of numpy arrays and json serializable values (arrays are copied immediately).
+        """
+        if self.__pending is not None and not self.__pending.done():
+            return
+        if self.__pending is not None:
+            self.__pending.result()     # raises exception of the previous write, if any
+        arrays, values = {}, {}
+        _flatten(state, "", arrays, values)
+        self.__pending = self.__writer.submit(self.__write, arrays, values)
+        self.__last = time.monotonic()
+
+    def load(self) -> dict or None:
+        """
+        Returns state saved in checkpoint file or None if there is no checkpoint.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            values = json.loads(str(data["__values__"]))
+            if values.get("version") != CHECKPOINT_VERSION:
+                raise Exception(f"Unsupported checkpoint version in file: {self.path}")
+            arrays = {key: data[key] for key in data.files if key != "__values__"}
+        return _unflatten(arrays, values["state"])
+
+    def close(self):
+        """
+        Waits for the last checkpoint to be written.
+        """
+        self.__writer.shutdown(wait=True)
+        if self.__pending is not None:
+            self.__pending.result()
+
+    def remove(self):
+        # finished run does not need its checkpoint any more
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __write(self, arrays: dict, values: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, __values__=np.array(json.dumps({"version": CHECKPOINT_VERSION, "state": values})),
+                     **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def checkpoint_path(q_name: str, pop_f_name: str, dims: int, no, checkpoint_dir: str = "checkpoints") -> str:
+    return os.path.join(checkpoint_dir, f"{q_name}_{dims}", f"{pop_f_name}_{no}{CHECKPOINT_EXTENSION}")
+
+
+def _flatten(state: dict, prefix: str, arrays: dict, values: dict):
+    # arrays are stored as separate .npz entries (named by their path in the state), other values as json
+    for key, value in state.items():
+        if isinstance(value, dict):
+            values[key] = {}
+            _flatten(value, f"{prefix}{key}/", arrays, values[key])
+        elif isinstance(value, np.ndarray):
+            arrays[prefix + key] = value.copy()
+            values[key] = {"__array__": prefix + key}
+        else:
+            values[key] = value
+
+
+def _unflatten(arrays: dict, values: dict) -> dict:
+    state = {}
+    for key, value in values.items():
+        if isinstance(value, dict) and "__array__" in value:
+            state[key] = arrays[value["__array__"]]
+        elif isinstance(value, dict):
+            state[key] = _unflatten(arrays, value)
+        else:
+            state[key] = value
+    return state
@@ -0,0 +1,169 @@
+import os
+import re
+
+import numpy as np
+
+_NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[-+]?inf|nan")
+
+
+def ecdf_targets(from_y: float, to_y: float, step_y: float) -> np.ndarray:
+    """
+    Target values (bounds) of ECDF curve - from the hardest (`from_y`) to the easiest one (`to_y`).
+    """
+    return np.linspace(from_y, to_y, int((to_y - from_y) / step_y))
+
+
+def ecdf_values(best_q: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """
+    Fraction of targets reached by best-so-far values `best_q` (array of any shape, e.g. runs x generations).
+    Target `bound` is reached when `best_q <= bound`.
+
+    Returns
+    -------
+    values : array of the same shape as `best_q`, values in [0, 1]
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    return (len(bounds) - np.searchsorted(bounds, best_q, side="left")) / len(bounds)
+
+
+def stack_runs(runs: list) -> np.ndarray:
+    """
+    Stacks best-so-far logs of many runs into (runs x generations) matrix, cutting all runs to the shortest one
+    (as population functions give different numbers of generations, MATLAB scripts in `ecdf_matlab` cut runs
+    of 'rect_wave_change_on_stagnation' in the same way).
+    """
+    length = min(len(run) for run in runs)
+    return np.vstack([np.asarray(run, dtype=np.float64)[:length] for run in runs])
+
+
+def mean_ecdf(runs: list or np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """
+    ECDF curve averaged over many runs - mean fraction of reached targets (values in [0, 1]).
+    Not the curve plotted by MATLAB scripts in `ecdf_matlab` as 'Zestawienie krzywych ECDF', see `mean_values(...)`.
+
+    Parameters
+    ----------
+    runs : (runs x generations) matrix or list of best-so-far logs (values only) of different lengths
+    bounds : target values (see `ecdf_targets(...)`)
+    """
+    runs = runs if isinstance(runs, np.ndarray) else stack_runs(runs)
+    return np.mean(ecdf_values(runs, bounds), axis=0)
+
+
+def mean_values(runs: list or np.ndarray) -> np.ndarray:
+    """
+    Best-so-far values averaged over many runs and rounded up - the curve plotted by MATLAB scripts in `ecdf_matlab`
+    as 'Zestawienie krzywych ECDF' (objective function values, not fractions of reached targets as `mean_ecdf(...)`).
+
+    Parameters
+    ----------
+    runs : (runs x generations) matrix or list of best-so-far logs (values only) of different lengths
+    """
+    runs = runs if isinstance(runs, np.ndarray) else stack_runs(runs)
+    return np.ceil(np.mean(runs, axis=0))
+
+
+def empirical_cdf(final_values) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Empirical distribution function of final results of runs (as 'Dystrybuanty empiryczne' in MATLAB scripts).
+
+    Returns
+    -------
+    x : sorted values
+    y : probabilities from 0 to 1
+    """
+    x = np.sort(np.asarray(final_values, dtype=np.float64))
+    return x, np.linspace(0.0, 1.0, len(x))
+
+
+def load_budget_logs(q_name: str, dims: int, pop_f_name: str,
+                     ecdf_dir: str = "ecdf_data") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reads budget logs (see `utils.budget_log.BudgetLog`) of all runs of an experiment
+    saved by `main.save_to_ecdf_data(...)`. All runs share the same checkpoints, so no resampling is needed.
+
+    Returns
+    -------
+    checkpoints : (checkpoints,) array - numbers of used evaluations
+    values : (runs x checkpoints) matrix - best-so-far values
+    seeds : (runs,) array - seeds of runs
+    """
+    directory = os.path.join(ecdf_dir, f"{q_name}_{dims}")
+    pattern = re.compile(rf"^{re.escape(pop_f_name)}_(\d+)\.npz$")
+    files = sorted((int(m[1]), name) for name in os.listdir(directory) if (m := pattern.match(name))) \
+        if os.path.isdir(directory) else []
+    if not files:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 0)), np.zeros(0, dtype=np.uint64)
+
+    logs = [np.load(os.path.join(directory, name)) for _, name in files]
+    return logs[0]["checkpoints"], np.vstack([log["values"] for log in logs]), np.array([log["seed"] for log in logs])
+
+
+def load_ecdf_data(q_name: str, dims: int, pop_f_name: str, ecdf_dir: str = "ecdf_data") -> list[np.ndarray]:
+    """
+    Reads old (text) best-so-far logs (values only, one per generation) of all runs of an experiment.
+    """
+    directory = os.path.join(ecdf_dir, f"{q_name}_{dims}")
+    if not os.path.isdir(directory):
+        return []
+    pattern = re.compile(rf"^{re.escape(pop_f_name)}_(\d+)\.txt$")
+    files = sorted((int(m[1]), name) for name in os.listdir(directory) if (m := pattern.match(name)))
+
+    runs = []
+    for _, name in files:
+        with open(os.path.join(directory, name), "r") as f:
+            for line in f:
+                numbers = np.array(_NUMBER_PATTERN.findall(line), dtype=np.float64)
+                if len(numbers):
+                    runs.append(numbers.reshape(-1, 2)[:, 1])  # (t, value) pairs
+    return runs
+
+
+def plot_ecdf_comparison(curves: dict, title: str = "Zestawienie krzywych ECDF", path: str = None,
+                         x_limit: int = None):
+    """
+    Plots curves of many population functions on one figure (first 4 solid, rest dashed, as in MATLAB scripts).
+    Curve is either array of y values or tuple of (x, y) arrays (e.g. from `empirical_cdf(...)`).
+    Figure is saved to `path` if given, shown otherwise.
+    """
+    import matplotlib.pyplot as plt     # imported only here - module is used by headless rendering workers as well
+
+    fig, ax = plt.subplots()
+    for i, (name, curve) in enumerate(curves.items()):
+        xy = curve if isinstance(curve, tuple) else (np.arange(len(curve)), curve)  # (x, y) or only y
+        ax.plot(*xy, "-" if i < 4 else "--", label=name.replace("_", " "))
+    ax.grid(True)
+    ax.legend()
+    ax.set_title(title)
+    if x_limit:
+        ax.set_xlim(0, x_limit)
+    if path:
+        fig.savefig(path, dpi=280)
+        plt.close(fig)
+    else:
+        plt.show()
+    return fig
+
+
+if __name__ == "__main__":
+    # python counterpart of `ecdf_matlab` scripts (f7, 2 dimensions): mean best-so-far values and empirical
+    # distribution functions (as MATLAB figures), and additionally ECDF curves of fractions of reached targets
+    from utils.results import load_results, results_path
+
+    root = os.path.join(os.path.dirname(__file__), "..")
+    pop_f_names = ["const", "linear_increase", "linear_decrease", "exponential_increase", "exponential_decrease",
+                   "sin_wave_change", "rect_wave_change", "rect_wave_change_on_stagnation"]
+    targets = ecdf_targets(700.0, 730.0, 1.0)
+    mean_curves, ecdf_curves, distributions = {}, {}, {}
+    for pop_f_name in pop_f_names:
+        checkpoints, runs, _ = load_budget_logs("f7", 2, pop_f_name, ecdf_dir=os.path.join(root, "ecdf_data"))
+        if len(runs):
+            mean_curves[pop_f_name] = (checkpoints, mean_values(runs))
+            ecdf_curves[pop_f_name] = (checkpoints, mean_ecdf(runs, targets))
+        results = results_path("f7", pop_f_name, 2, data_dir=os.path.join(root, "data"))
+        if os.path.exists(results):
+            distributions[pop_f_name] = empirical_cdf(load_results(results)["value"])
+
+    plot_ecdf_comparison(mean_curves, title="Zestawienie krzywych ECDF")
+    plot_ecdf_comparison(ecdf_curves, title="Krzywe ECDF (odsetek osiągniętych celów)")
+    plot_ecdf_comparison(distributions, title="Dystrybuanty empiryczne")
@@ -0,0 +1,89 @@
+import heapq
+
+import numpy as np
+
+from utils.population import Population
+
+
+class EliteTracker:
+
+    def __init__(self, k: int = 1):
+        """
+        Incremental record of the best points found so far (for minimisation).
+        Keeps running best point and value, and optionally the `k` best points in a heap,
+        so that checking the best value costs O(1) instead of scanning all evaluated points.
+
+        Parameters
+        ----------
+        k : int
+            Number of best points to keep (1 - only the best one).
+        """
+        self.k = k
+        self.best_value = np.inf
+        self.best_cords = None
+        self.__heap = []                     # max-heap (by negated value) of k best points: (-value, id, cords)
+        self.__next_id = 0                   # tie-breaker, arrays are not comparable
+
+    def update(self, population: Population) -> bool:
+        """
+        Updates record with newly evaluated points.
+
+        Returns
+        -------
+        improved : bool - True if best value was improved
+        """
+        if not len(population):
+            return False
+        i = int(np.argmin(population.values))
+        improved = population.values[i] < self.best_value
+        if improved:
+            self.best_value = float(population.values[i])
+            self.best_cords = population.cords[i].copy()
+
+        if self.k > 1:
+            self.__update_heap(population)
+        return improved
+
+    def top(self) -> Population:
+        """
+        Returns (up to) k best points found so far, sorted from the best one.
+        """
+        if self.k == 1:
+            if self.best_cords is None:
+                return Population(cords=np.empty((0, 0)))
+            return Population(cords=self.best_cords[np.newaxis, :], values=[self.best_value])
+
+        elite = sorted(self.__heap, reverse=True)
+        return Population(cords=np.array([cords for _, _, cords in elite]),
+                          values=[-value for value, _, _ in elite])
+
+    def get_state(self) -> dict:
+        # for checkpoints (see `utils.checkpoint.Checkpointer`)
+        return {"k": self.k, "best_value": self.best_value, "best_cords": self.best_cords,
+                "heap_values": np.array([value for value, _, _ in self.__heap]),
+                "heap_ids": np.array([i for _, i, _ in self.__heap], dtype=np.int64),
+                "heap_cords": np.array([cords for _, _, cords in self.__heap]),
+                "next_id": self.__next_id}
+
+    def set_state(self, state: dict):
+        self.k = state["k"]
+        self.best_value = state["best_value"]
+        self.best_cords = state["best_cords"]
+        # heap order is kept, so the list is still a valid heap
+        self.__heap = [(float(value), int(i), cords.copy()) for value, i, cords
+                       in zip(state["heap_values"], state["heap_ids"], state["heap_cords"])]
+        self.__next_id = state["next_id"]
+
+    def __update_heap(self, population: Population):
+        # only k best points of the batch may enter the heap
+        candidates = np.arange(len(population))
+        if len(population) > self.k:
+            candidates = np.argpartition(population.values, self.k - 1)[:self.k]
+
+        for i in candidates:
+            item = (-float(population.values[i]), self.__next_id, population.cords[i].copy())
+            self.__next_id += 1
+            if len(self.__heap) < self.k:
+                heapq.heappush(self.__heap, item)
+            elif item[0] > self.__heap[0][0]:
+                heapq.heapreplace(self.__heap, item)
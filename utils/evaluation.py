@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+
+class Evaluator:
+
+    def __init__(self, q: Callable):
+        """
+        Evaluation stage of the algorithm - evaluates whole generation of points with a single batched call
+        of the objective function and keeps track of used objective function budget.
+
+        Parameters
+        ----------
+        q : func
+            Objective function accepting matrix of shape (M, D) and returning vector of shape (M,)
+            (as `cec2017.functions` do).
+        """
+        self.q = q
+        self.q_counter = 0
+        self.last_charged = np.zeros(0, dtype=bool)     # which points of the last batch were counted
+
+    def __call__(self, cords: np.ndarray, count: bool = True) -> np.ndarray:
+        """
+        Evaluates points.
+
+        Parameters
+        ----------
+        cords : array of shape (M, D) or (D,)
+            Points to evaluate.
+        count : bool
+            Whether evaluations are counted towards used budget (`q_counter`).
+
+        Returns
+        -------
+        values : array of shape (M,) - objective function values of the points
+        """
+        cords = np.atleast_2d(np.asarray(cords, dtype=np.float64))
+        values = np.asarray(self.q(cords), dtype=np.float64).reshape(cords.shape[0])
+        if not count:
+            self.last_charged = np.zeros(cords.shape[0], dtype=bool)
+        elif isinstance(self.q, CachedObjective):
+            self.last_charged = self.q.last_charged     # cache hits may be free (depending on cache policy)
+        else:
+            self.last_charged = np.ones(cords.shape[0], dtype=bool)
+        self.q_counter += int(np.count_nonzero(self.last_charged))
+        return values
+
+
+class CachedObjective:
+
+    def __init__(self, q: Callable, max_size: int = 100000, count_hits: bool = True):
+        """
+        Memoizing wrapper of objective function - values of already evaluated points are taken from bounded
+        LRU cache (keyed by content hash of point coordinates) instead of being calculated again.
+
+        Parameters
+        ----------
+        q : func
+            Objective function accepting matrix of shape (M, D) and returning vector of shape (M,).
+        max_size : int
+            Maximum number of points kept in cache (least recently used ones are removed first).
+        count_hits : bool
+            Whether cache hits are counted towards used budget (True - budget accounting does not depend on cache).
+        """
+        self.q = q
+        self.__name__ = q.__name__
+        self.max_size = max_size
+        self.count_hits = count_hits
+        self.hits = 0
+        self.misses = 0
+        self.last_charged = np.zeros(0, dtype=bool)     # which points of the last call were charged to the budget
+        self.__cache = OrderedDict()
+
+    def __call__(self, cords: np.ndarray) -> np.ndarray or float:
+        single = np.ndim(cords) == 1
+        cords = np.atleast_2d(np.asarray(cords, dtype=np.float64))
+        keys = [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in cords]
+
+        values = np.empty(cords.shape[0])
+        missing = {}    # key -> indices of points with this key (duplicates in one batch evaluated once)
+        for i, key in enumerate(keys):
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                values[i] = self.__cache[key]
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            new_values = np.asarray(self.q(cords[first]), dtype=np.float64).reshape(len(first))
+            for (key, indices), value in zip(missing.items(), new_values):
+                values[indices] = value
+                self.__cache[key] = value
+            while len(self.__cache) > self.max_size:
+                self.__cache.popitem(last=False)
+
+        charged = np.ones(cords.shape[0], dtype=bool)
+        if not self.count_hits:
+            charged[:] = False
+            charged[[indices[0] for indices in missing.values()]] = True
+        self.last_charged = charged
+        self.misses += len(missing)
+        self.hits += cords.shape[0] - len(missing)
+        return float(values[0]) if single else values
+
+    def __len__(self):
+        return len(self.__cache)
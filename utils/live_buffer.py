@@ -0,0 +1,106 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class FrameBuffer:
+    # header (int64): [latest frame id, capacity, slots, (frame id, generation, number of points) for every slot]
+    __GLOBAL_FIELDS = 3
+    __SLOT_FIELDS = 3
+
+    def __init__(self, capacity: int = 10000, slots: int = 4, columns: int = 3, name: str = None):
+        """
+        Shared memory ring buffer of frames (point clouds) for live plotting.
+        Writer (algorithm) never blocks - it overwrites the oldest slot, so frames are dropped when
+        reader (plot process) falls behind. Reader always takes the latest complete frame.
+        Created by the writer, attached by name in the plot process - pickled buffer (e.g. when the plot process
+        is started by 'spawn' or 'forkserver') holds only its name and shape and is attached again when unpickled.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of points in a frame (bigger frames are truncated).
+        slots : int
+            Number of frames kept in the buffer.
+        columns : int
+            Number of values describing a point (3 - x, y, z).
+        name : str
+            Name of existing shared memory to attach to (new one is created if not given).
+        """
+        self.capacity = capacity
+        self.slots = slots
+        self.columns = columns
+        header_size = (self.__GLOBAL_FIELDS + self.__SLOT_FIELDS * slots) * 8
+        data_size = slots * capacity * columns * 8
+        if name is None:
+            self.__memory = shared_memory.SharedMemory(create=True, size=header_size + data_size)
+        else:
+            self.__memory = self.__attach(name)
+        self.name = self.__memory.name
+        self.__header = np.ndarray(self.__GLOBAL_FIELDS + self.__SLOT_FIELDS * slots, dtype=np.int64,
+                                   buffer=self.__memory.buf)
+        self.__data = np.ndarray((slots, capacity, columns), dtype=np.float64,
+                                 buffer=self.__memory.buf, offset=header_size)
+        if name is None:
+            self.__header[:] = 0
+            self.__header[0] = -1
+            self.__header[1:3] = capacity, slots
+
+    def __getstate__(self) -> dict:
+        # views of shared memory would be pickled as copies - only the name is passed to the other process
+        return {"capacity": self.capacity, "slots": self.slots, "columns": self.columns, "name": self.name}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def write(self, points: np.ndarray, generation: int = 0):
+        """
+        Writes new frame (array of shape (N, columns)) to the buffer.
+        """
+        frame_id = int(self.__header[0]) + 1
+        slot = frame_id % self.slots
+        n = min(len(points), self.capacity)
+        info = self.__slot_info(slot)
+
+        info[0] = -1                                # slot is being written
+        self.__data[slot, :n] = points[:n]
+        info[1:] = generation, n
+        info[0] = frame_id
+        self.__header[0] = frame_id                 # frame published
+
+    def read(self, last_frame_id: int = -1) -> tuple[int, int, np.ndarray] or None:
+        """
+        Reads the latest frame if it is newer than `last_frame_id`.
+
+        Returns
+        -------
+        (frame_id, generation, points) or None if there is no new (complete) frame
+        """
+        frame_id = int(self.__header[0])
+        if frame_id <= last_frame_id:
+            return None
+        slot = frame_id % self.slots
+        info = self.__slot_info(slot)
+        generation, n = int(info[1]), int(info[2])
+        points = self.__data[slot, :n].copy()
+        if info[0] != frame_id:                     # slot overwritten while copying - frame dropped
+            return None
+        return frame_id, generation, points
+
+    def close(self, unlink: bool = False):
+        self.__header, self.__data = None, None
+        self.__memory.close()
+        if unlink:
+            self.__memory.unlink()
+
+    @staticmethod
+    def __attach(name: str) -> shared_memory.SharedMemory:
+        # only the creating process unlinks the memory (see `close(unlink=True)`)
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)   # python 3.13+
+        except TypeError:
+            return shared_memory.SharedMemory(name=name)
+
+    def __slot_info(self, slot: int) -> np.ndarray:
+        start = self.__GLOBAL_FIELDS + self.__SLOT_FIELDS * slot
+        return self.__header[start:start + self.__SLOT_FIELDS]
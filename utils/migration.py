@@ -0,0 +1,137 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.population import Population
+
+
+class MigrationBuffer:
+    # header (int64) of every island: [published epoch, consumed epoch, finished]
+    __FIELDS = 3
+    __PUBLISHED, __CONSUMED, __FINISHED = range(__FIELDS)
+
+    def __init__(self, islands: int, migrants: int, dims: int, slots: int = 2, name: str = None):
+        """
+        Shared memory buffer of migrants exchanged between islands in a ring (island i sends to island i + 1).
+        Exchange is synchronised by migration epochs, so runs of the island model are reproducible:
+        island receives in epoch `e` exactly the migrants its neighbour sent in epoch `e` (nothing, if neighbour
+        has already finished). Sender waits only if the receiver has not yet consumed migrants of epoch `e - slots`.
+        Created by the main process, attached by name in worker processes (`MigrationBuffer(..., name=name)`).
+
+        Parameters
+        ----------
+        islands : int
+            Number of islands.
+        migrants : int
+            Number of individuals sent in one epoch.
+        dims : int
+            Number of dimensions of points.
+        slots : int
+            Number of epochs kept in the buffer for every island.
+        name : str
+            Name of existing shared memory to attach to (new one is created if not given).
+        """
+        self.islands, self.migrants, self.dims, self.slots = islands, migrants, dims, slots
+        header_size = islands * self.__FIELDS * 8
+        size = header_size + islands * slots * migrants * (dims + 1) * 8
+        if name is None:
+            self.__memory = shared_memory.SharedMemory(create=True, size=size)
+            self.__owner = True
+        else:
+            self.__memory = self.__attach(name)
+            self.__owner = False
+        self.name = self.__memory.name
+        self.__header = np.ndarray((islands, self.__FIELDS), dtype=np.int64, buffer=self.__memory.buf)
+        # record: (value, *cords)
+        self.__data = np.ndarray((islands, slots, migrants, dims + 1), dtype=np.float64,
+                                 buffer=self.__memory.buf, offset=header_size)
+        if self.__owner:
+            self.__header[:] = 0
+
+    def send(self, island: int, epoch: int, population: Population):
+        """
+        Publishes best `migrants` individuals of `population` as migrants of `island` in `epoch` (counting from 1).
+        """
+        receiver = self.__header[(island + 1) % self.islands]
+        while epoch - int(receiver[self.__CONSUMED]) > self.slots and not receiver[self.__FINISHED]:
+            time.sleep(0.0001)
+
+        best = np.argsort(population.values, kind="stable")[:self.migrants]
+        record = self.__data[island, epoch % self.slots]
+        record[:] = np.nan
+        record[:len(best), 0] = population.values[best]
+        record[:len(best), 1:] = population.cords[best]
+        self.__header[island, self.__PUBLISHED] = epoch
+
+    def receive(self, island: int, epoch: int) -> Population:
+        """
+        Migrants sent to `island` in `epoch` (waits for the sender), empty population if the sender has finished
+        before reaching `epoch`.
+        """
+        sender = (island - 1) % self.islands
+        header = self.__header[sender]
+        while header[self.__PUBLISHED] < epoch and not header[self.__FINISHED]:
+            time.sleep(0.0001)
+        if header[self.__PUBLISHED] < epoch:
+            migrants = Population.empty(0, self.dims)
+        else:
+            record = self.__data[sender, epoch % self.slots]
+            record = record[~np.isnan(record[:, 0])]
+            migrants = Population(cords=record[:, 1:].copy(), values=record[:, 0].copy())
+        self.__header[island, self.__CONSUMED] = epoch
+        return migrants
+
+    def finish(self, island: int):
+        # island will not send nor receive anything more
+        self.__header[island, self.__FINISHED] = 1
+
+    def close(self):
+        self.__header, self.__data = None, None
+        self.__memory.close()
+        if self.__owner:
+            self.__memory.unlink()
+
+    @staticmethod
+    def __attach(name: str) -> shared_memory.SharedMemory:
+        # only the creating process unlinks the memory (older python registers it again in the resource tracker
+        # shared with the main process, which is harmless)
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)   # python 3.13+
+        except TypeError:
+            return shared_memory.SharedMemory(name=name)
+
+
+class Migration:
+
+    def __init__(self, buffer: MigrationBuffer, island: int, interval: int = 10):
+        """
+        Migration of one island: every `interval` generations its best individuals are sent to the next island
+        and migrants received from the previous island replace its worst individuals.
+        Passed to `algorithm(..., migration=...)`.
+        """
+        self.buffer = buffer
+        self.island = island
+        self.interval = interval
+        self.epoch = 0
+        self.received = 0           # number of received migrants
+
+    def exchange(self, generation: int, population: Population) -> Population:
+        """
+        Exchanges migrants if `generation` (counting from 1) ends migration interval, returns (new) population.
+        """
+        if generation % self.interval or self.buffer.islands < 2:
+            return population
+        self.epoch += 1
+        self.buffer.send(self.island, self.epoch, population)
+        migrants = self.buffer.receive(self.island, self.epoch)
+        n = min(len(migrants), len(population))
+        if not n:
+            return population
+        self.received += n
+        keep = np.argsort(population.values, kind="stable")[:len(population) - n]
+        return Population.concatenate([Population(cords=population.cords[keep], values=population.values[keep]),
+                                       Population(cords=migrants.cords[:n], values=migrants.values[:n])])
+
+    def finish(self):
+        self.buffer.finish(self.island)
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class Population:
+
+    def __init__(self, cords: np.ndarray, values: np.ndarray = None):
+        """
+        Array-backed population of points (replaces `dict[tuple, float]`).
+        Duplicate points are kept as separate individuals, so `len(population)` is always the real population size.
+
+        Parameters
+        ----------
+        cords : array of shape (N, D)
+            Coordinates of N points in D-dimensional space.
+        values : array of shape (N,), optional
+            Objective function values of the points, NaN if not evaluated yet.
+        """
+        self.cords = np.asarray(cords, dtype=np.float64)
+        if self.cords.ndim != 2:
+            raise Exception(f"Population coordinates must be of shape (N, D), got: {self.cords.shape}")
+        if values is None:
+            values = np.full(self.cords.shape[0], np.nan)
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.shape != (self.cords.shape[0],):
+            raise Exception(f"Population values must be of shape ({self.cords.shape[0]},), got: {self.values.shape}")
+
+    @classmethod
+    def empty(cls, size: int, dims: int):
+        """
+        Preallocated population of `size` points in `dims`-dimensional space, to be filled in place.
+        """
+        return cls(cords=np.empty((size, dims)), values=np.full(size, np.nan))
+
+    @classmethod
+    def concatenate(cls, populations: list):
+        """
+        Joins list of populations (of the same dimension) into one population.
+        """
+        return cls(cords=np.concatenate([p.cords for p in populations]),
+                   values=np.concatenate([p.values for p in populations]))
+
+    def __len__(self):
+        return self.cords.shape[0]
+
+    @property
+    def dims(self) -> int:
+        return self.cords.shape[1]
+
+    def best(self) -> tuple[np.ndarray, float]:
+        """
+        Returns coordinates and value of the point with minimal objective function value.
+        """
+        i = np.nanargmin(self.values)
+        return self.cords[i], float(self.values[i])
+
+    def as_points(self) -> list[tuple[float, float, float]]:
+        """
+        Converts population to list of 3D tuples (x, y, value) accepted by `DataVisualiser`.
+        Only the first two coordinates are used.
+        """
+        return list(zip(self.cords[:, 0].tolist(), self.cords[:, 1].tolist(), self.values.tolist()))
@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+import numpy as np
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+PHASES = ("pop_f", "select", "mutation", "q", "logging")
+
+
+class PhaseTimer:
+
+    def __init__(self, phases: tuple = PHASES, trace_memory: bool = False):
+        """
+        Wall time spent in phases of every generation of the algorithm, evaluations per second and peak memory.
+        Used as `with timer.phase("select"): ...` and `timer.end_generation(evaluations)` after every generation.
+        When profiling is disabled `NULL_TIMER` is passed instead, which does nothing.
+
+        Parameters
+        ----------
+        phases : tuple of str
+            Names of timed phases (columns of per-generation times).
+        trace_memory : bool
+            Whether peak memory of Python and numpy allocations is traced with `tracemalloc` (slows the run down).
+            Otherwise only peak resident memory of the whole process is reported (if available).
+        """
+        self.phases = tuple(phases)
+        self.trace_memory = trace_memory
+        self.__index = {name: i for i, name in enumerate(self.phases)}
+        self.__current = np.zeros(len(self.phases))
+        self.__generations = []         # rows of phase times of finished generations
+        self.__evaluations = []         # evaluations charged in finished generations
+        self.__start = None
+        self.__stop = None
+        self.__traced_peak = None
+        self.__tracing = False         # whether tracemalloc was started by this timer
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self.__start = time.perf_counter()
+
+    def stop(self):
+        self.__stop = time.perf_counter()
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.__traced_peak = tracemalloc.get_traced_memory()[1]
+            if self.__tracing:
+                tracemalloc.stop()
+                self.__tracing = False
+
+    def phase(self, name: str):
+        return _Phase(self.__current, self.__index[name])
+
+    def end_generation(self, evaluations: int = 0):
+        """
+        Closes current generation - its phase times are stored as a new row.
+        """
+        self.__generations.append(self.__current.copy())
+        self.__evaluations.append(evaluations)
+        self.__current[:] = 0.0
+
+    @property
+    def generation_times(self) -> np.ndarray:
+        """
+        Array of shape (generations, phases) - wall time [s] of every phase in every generation.
+        """
+        return np.array(self.__generations).reshape(-1, len(self.phases))
+
+    def record(self) -> dict:
+        """
+        Structured summary of the run (json serializable).
+        """
+        times = self.generation_times
+        evaluations = int(np.sum(self.__evaluations))
+        stop = self.__stop if self.__stop is not None else time.perf_counter()
+        wall_time = stop - self.__start if self.__start is not None else float(np.sum(times))
+        phase_totals = times.sum(axis=0)
+        q_time = float(phase_totals[self.__index["q"]]) if "q" in self.__index else 0.0
+        return {
+            "generations": len(times),
+            "evaluations": evaluations,
+            "wall_time": wall_time,
+            "evals_per_sec": evaluations / wall_time if wall_time > 0 else None,
+            "q_evals_per_sec": evaluations / q_time if q_time > 0 else None,
+            "phase_totals": dict(zip(self.phases, phase_totals.tolist())),
+            "phase_share": dict(zip(self.phases, (phase_totals / wall_time if wall_time > 0
+                                                  else np.zeros_like(phase_totals)).tolist())),
+            "peak_memory": self.peak_memory(),
+            "per_generation": {"evaluations": [int(e) for e in self.__evaluations],
+                               **{name: times[:, i].tolist() for i, name in enumerate(self.phases)}},
+        }
+
+    def peak_memory(self) -> dict:
+        """
+        Peak memory [bytes]: 'traced' - Python and numpy allocations (only with `trace_memory`),
+        'rss' - resident memory of the whole process (None where not available).
+        """
+        traced = self.__traced_peak
+        if self.trace_memory and self.__stop is None and tracemalloc.is_tracing():
+            traced = tracemalloc.get_traced_memory()[1]
+        rss = None
+        if resource:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss = rss if sys.platform == "darwin" else rss * 1024
+        return {"traced": traced, "rss": rss}
+
+    def save(self, path: str, **metadata):
+        """
+        Saves `record()` (with additional `metadata` fields, e.g. q_name, seed) to json file.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump({**metadata, **self.record()}, f, indent=4)
+        os.replace(path + ".tmp", path)
+
+
+class _Phase:
+    __slots__ = ("times", "i", "start")
+
+    def __init__(self, times: np.ndarray, i: int):
+        self.times, self.i = times, i
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.times[self.i] += time.perf_counter() - self.start
+
+
+class _NullTimer:
+    # disabled profiling - the same (reused) do-nothing context manager for every phase
+    __NULL_PHASE = nullcontext()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def phase(self, name: str):
+        return self.__NULL_PHASE
+
+    def end_generation(self, evaluations: int = 0):
+        pass
+
+
+NULL_TIMER = _NullTimer()
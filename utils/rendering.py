@@ -0,0 +1,163 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.archive import Archive
+from utils.ecdf import ecdf_targets, mean_ecdf, load_budget_logs
+
+# Headless (Agg, no pyplot, no GUI processes) rendering of figures of whole sweeps straight to files.
+# Every worker process keeps one figure (with its artists) per figure kind and only updates data between runs.
+_FIGURES = {}
+
+
+def render_population(pop_size_log: np.ndarray, path: str, pop_min: int = None, pop_max: int = None):
+    """
+    Renders population size (array of (t, population size) rows) to file `path` (format taken from extension).
+    """
+    pop_size_log = np.asarray(pop_size_log).reshape(-1, 2)
+    fig, ax, (line,) = __figure("population", title="Zmienność populacji", artists=("line",))
+    line.set_data(pop_size_log[:, 0], pop_size_log[:, 1])
+    ax.set_xlim(pop_size_log[0, 0], max(pop_size_log[-1, 0], pop_size_log[0, 0] + 1))
+    ax.set_ylim(pop_min if pop_min is not None else 0,
+                (pop_max if pop_max is not None else pop_size_log[:, 1].max()) + 1)
+    __save(fig, path)
+
+
+def render_ecdf(checkpoints: np.ndarray, curve: np.ndarray, path: str, title: str = "Krzywa ECDF"):
+    """
+    Renders ECDF curve (fraction of targets reached at every budget checkpoint) to file `path`.
+    """
+    fig, ax, (line,) = __figure("ecdf", title=title, artists=("line",))
+    line.set_data(checkpoints, curve)
+    ax.set_xscale("log")
+    ax.set_xlim(max(checkpoints[0], 1), max(checkpoints[-1], 2))
+    ax.set_ylim(0, 1)
+    fig.suptitle(title, fontsize=14)
+    __save(fig, path)
+
+
+def render_archive(cords: np.ndarray, values: np.ndarray, path: str, limits: tuple = (-100, 100)):
+    """
+    Renders archived points (first two coordinates, coloured by objective function value) to file `path`.
+    """
+    fig, ax, (scatter,) = __figure("archive", title="Wizualizacja", artists=("scatter",))
+    scatter.set_offsets(cords[:, :2])
+    scatter.set_array(values)
+    if len(values):
+        scatter.set_clim(np.min(values), np.max(values))
+    ax.set_xlim(*limits)
+    ax.set_ylim(*limits)
+    __save(fig, path)
+
+
+def render_sweep(ecdf_dir: str = "ecdf_data", archive_dir: str = "archive", out_dir: str = "figures",
+                 formats: tuple = ("png",), workers: int = None, ecdf_step: float = 1.0,
+                 ecdf_range: dict = None) -> list[str]:
+    """
+    Renders figures of all experiments of a sweep in a pool of worker processes:
+        - population size of every run (from `ecdf_dir/{q_name}_{dims}/{pop_f_name}_{no}.npz`),
+        - ECDF curve of every experiment (averaged over runs),
+        - archived points of every run saved by archive in 'stream' mode (`archive_dir/*.bin`).
+
+    Parameters
+    ----------
+    formats: tuple - file formats (extensions accepted by matplotlib, e.g. 'png', 'svg')
+    workers: int - number of worker processes, None means number of CPUs
+    ecdf_step: float - distance between ECDF targets
+    ecdf_range: dict - {q_name: (from_y, to_y)} range of ECDF targets, min and max of best values if not given
+
+    Returns
+    -------
+    paths: list of rendered files
+    """
+    ecdf_range = ecdf_range if ecdf_range else {}
+    tasks = []
+    for experiment in sorted(os.listdir(ecdf_dir)) if os.path.isdir(ecdf_dir) else []:
+        match = re.match(r"^(.+)_(\d+)$", experiment)
+        if not match:
+            continue
+        q_name, dims = match[1], int(match[2])
+        pop_f_names = sorted({re.sub(r"_\d+\.npz$", "", name)
+                              for name in os.listdir(os.path.join(ecdf_dir, experiment)) if name.endswith(".npz")})
+        for pop_f_name in pop_f_names:
+            base = os.path.join(out_dir, experiment, pop_f_name)
+            tasks.append(("ecdf", (q_name, dims, pop_f_name, ecdf_dir, ecdf_step, ecdf_range.get(q_name)), base))
+            for name in os.listdir(os.path.join(ecdf_dir, experiment)):
+                if re.match(rf"^{re.escape(pop_f_name)}_\d+\.npz$", name):
+                    tasks.append(("population", os.path.join(ecdf_dir, experiment, name),
+                                  os.path.join(out_dir, experiment, name[:-len(".npz")] + "_pop")))
+
+    for name in sorted(os.listdir(archive_dir)) if os.path.isdir(archive_dir) else []:
+        if name.endswith(".bin"):
+            tasks.append(("archive", os.path.join(archive_dir, name),
+                          os.path.join(out_dir, "archive", name[:-len(".bin")])))
+
+    # tasks of the same kind next to each other, so that every worker mostly reuses the same figure
+    tasks.sort(key=lambda task: task[0])
+    tasks = [(kind, source, base, formats) for kind, source, base in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rendered = executor.map(_render_task, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count()))))
+        return [path for paths in rendered for path in paths]
+
+
+def _render_task(task: tuple) -> list[str]:
+    kind, source, base, formats = task
+    paths = [f"{base}.{extension}" for extension in formats]
+    os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+
+    if kind == "population":
+        pop_sizes = np.load(source)["pop_sizes"]
+        if not len(pop_sizes):
+            return []
+        for path in paths:
+            render_population(pop_sizes, path)
+
+    elif kind == "ecdf":
+        q_name, dims, pop_f_name, ecdf_dir, step, y_range = source
+        checkpoints, runs, _ = load_budget_logs(q_name, dims, pop_f_name, ecdf_dir=ecdf_dir)
+        if not len(runs):
+            return []
+        from_y, to_y = y_range if y_range else (np.floor(np.min(runs)), np.ceil(np.max(runs)))
+        curve = mean_ecdf(runs, ecdf_targets(from_y, to_y, step))
+        for path in paths:
+            render_ecdf(checkpoints, curve, path, title=f"Krzywa ECDF - {q_name}, {dims}D, {pop_f_name}")
+
+    elif kind == "archive":
+        archived = Archive.read_file(source)
+        for path in paths:
+            render_archive(archived.cords, archived.values, path)
+    return paths
+
+
+def __figure(kind: str, title: str, artists: tuple) -> tuple:
+    if kind not in _FIGURES:
+        fig = Figure(figsize=(6.4, 4.8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.grid(True)
+        fig.suptitle(title, fontsize=14)
+        created = []
+        for artist in artists:
+            if artist == "line":
+                created.append(ax.plot([], [], c="red")[0])
+            elif artist == "scatter":
+                created.append(ax.scatter(np.empty(0), np.empty(0), c=np.empty(0), s=1, cmap="gist_ncar"))
+        _FIGURES[kind] = fig, ax, tuple(created)
+    return _FIGURES[kind]
+
+
+def __save(fig: Figure, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fig.savefig(path)
+
+
+if __name__ == "__main__":
+    root = os.path.join(os.path.dirname(__file__), "..")
+    for rendered_path in render_sweep(ecdf_dir=os.path.join(root, "ecdf_data"),
+                                      archive_dir=os.path.join(root, "archive"),
+                                      out_dir=os.path.join(root, "figures")):
+        print(rendered_path)
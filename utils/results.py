@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+
+# Binary results store - one file per experiment (objective function, population function, dimension).
+#
+# Layout (little-endian, version 1):
+#     header  - 16 bytes: magic b"EARES\0", version (uint16), dimension D (uint32), reserved (uint32)
+#     records - fixed size, one per run: value (float64), cords (D x float64), seed (uint64),
+#               q_used (int64), run_time (float64)
+# Files can be appended record by record and read back (memory-mapped) as NumPy structured arrays.
+
+RESULTS_VERSION = 1
+RESULTS_EXTENSION = ".res"
+NO_SEED = np.iinfo(np.uint64).max       # seed of runs saved before seeds were recorded
+NO_VALUE = -1                           # q_used / run_time of runs saved before they were recorded
+
+_MAGIC = b"EARES\0"
+_HEADER_DTYPE = np.dtype([("magic", "S6"), ("version", "<u2"), ("dims", "<u4"), ("reserved", "<u4")])
+
+
+def results_dtype(dims: int) -> np.dtype:
+    return np.dtype([("value", "<f8"), ("cords", "<f8", (dims,)), ("seed", "<u8"),
+                     ("q_used", "<i8"), ("run_time", "<f8")])
+
+
+def results_path(q_name: str, pop_f_name: str, dims: int, data_dir: str = "data", variant: str = None) -> str:
+    variant = f"_{variant}" if variant else ""
+    return os.path.join(data_dir, f"{q_name}_{pop_f_name}_{dims}{variant}{RESULTS_EXTENSION}")
+
+
+def save_result(path: str, value: float, cords, seed: int = None, q_used: int = None, run_time: float = None):
+    """
+    Appends result of a single run to results file `path` (created if not exists).
+    Must not be called concurrently for the same file (in sweeps results are saved by the main process only).
+    """
+    cords = np.asarray(cords, dtype=np.float64).reshape(-1)
+    record = np.zeros(1, dtype=results_dtype(cords.shape[0]))
+    record["value"] = value
+    record["cords"] = cords
+    record["seed"] = NO_SEED if seed is None else seed
+    record["q_used"] = NO_VALUE if q_used is None else q_used
+    record["run_time"] = NO_VALUE if run_time is None else run_time
+    save_records(path, record)
+
+
+def save_records(path: str, records: np.ndarray):
+    """
+    Appends structured array of records (of `results_dtype(...)`) to results file `path`.
+    """
+    dims = records.dtype["cords"].shape[0]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.exists(path) and os.path.getsize(path):
+        if _read_header(path)["dims"] != dims:
+            raise Exception(f"Results file [{path}] holds points of other dimension than {dims}")
+        with open(path, "ab") as f:
+            records.tofile(f)
+    else:
+        header = np.array([(_MAGIC, RESULTS_VERSION, dims, 0)], dtype=_HEADER_DTYPE)
+        with open(path, "wb") as f:
+            header.tofile(f)
+            records.tofile(f)
+
+
+def load_results(path: str) -> np.ndarray:
+    """
+    Loads all runs of an experiment as (memory-mapped) structured array with fields:
+    'value', 'cords', 'seed', 'q_used', 'run_time'.
+    """
+    header = _read_header(path)
+    dtype = results_dtype(int(header["dims"]))
+    if os.path.getsize(path) == _HEADER_DTYPE.itemsize:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER_DTYPE.itemsize)
+
+
+def convert_text_results(path_txt: str, path_res: str = None) -> str:
+    """
+    One-time conversion of old text results file (lines of `value<TAB>(cords)[<TAB>seed]`)
+    to binary results file (overwritten if exists). Returns path of the new file.
+    """
+    path_res = path_res if path_res else os.path.splitext(path_txt)[0] + RESULTS_EXTENSION
+    values, cords, seeds = [], [], []
+    with open(path_txt, "r") as f:
+        for line in f:
+            line = line.strip().split("\t")
+            if not line[0]:
+                continue
+            values.append(float(line[0]))
+            cords.append(np.array(line[1].strip("()").split(","), dtype=np.float64))
+            seeds.append(int(line[2]) if len(line) > 2 and line[2] != "None" else NO_SEED)
+
+    records = np.zeros(len(values), dtype=results_dtype(cords[0].shape[0] if cords else 0))
+    records["value"] = values
+    records["cords"] = cords
+    records["seed"] = seeds
+    records["q_used"] = NO_VALUE
+    records["run_time"] = NO_VALUE
+    if os.path.exists(path_res):
+        os.remove(path_res)
+    save_records(path_res, records)
+    return path_res
+
+
+def convert_data_dir(data_dir: str = "data") -> list[str]:
+    """
+    Converts every old text results file in `data_dir` to binary format.
+    """
+    return [convert_text_results(os.path.join(data_dir, name))
+            for name in sorted(os.listdir(data_dir)) if name.endswith(".txt")]
+
+
+def _read_header(path: str) -> np.void:
+    header = np.fromfile(path, dtype=_HEADER_DTYPE, count=1)
+    if not len(header) or header[0]["magic"] != _MAGIC.rstrip(b"\0"):
+        raise Exception(f"[{path}] is not a results file")
+    if header[0]["version"] != RESULTS_VERSION:
+        raise Exception(f"Unsupported results file version: [{header[0]['version']}]")
+    return header[0]
+
+
+if __name__ == "__main__":
+    # one-time conversion of old text results
+    for converted in convert_data_dir(os.path.join(os.path.dirname(__file__), "..", "data")):
+        print(converted)
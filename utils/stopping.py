@@ -0,0 +1,96 @@
+import time
+
+import numpy as np
+
+STOP_REASONS = ("budget", "target", "no_improvement", "wall_time")
+
+
+class StoppingRules:
+
+    def __init__(self, target: float = None, no_improvement: int = None, wall_time: float = None):
+        """
+        Early termination of the algorithm (checked after every generation), the run stops when any rule is met:
+            - best value found reaches `target` (e.g. optimum + ε, see `get_function.optimum(...)`),
+            - best value has not improved for `no_improvement` evaluations,
+            - run has lasted `wall_time` seconds,
+        otherwise when destination function budget is used ('budget').
+        After the run `reason` holds the stop reason and `evaluations_to_target` the exact number of evaluations
+        used when the target was reached for the first time (None if not reached).
+
+        Parameters
+        ----------
+        target : float
+            Target value (minimisation).
+        no_improvement : int
+            Maximal number of evaluations without improvement of best value.
+        wall_time : float
+            Maximal wall time of the run [s].
+        """
+        self.target = target
+        self.no_improvement = no_improvement
+        self.wall_time = wall_time
+        self.reason = None
+        self.evaluations_to_target = None
+        self.q_counter = 0
+        self.best_value = np.inf
+        self.last_improvement = 0       # number of evaluations used when best value was improved last time
+        self.elapsed = 0.0              # wall time of previous parts of resumed run
+        self.__start = None
+
+    def start(self, best_value: float = np.inf):
+        """
+        Starts wall clock, `best_value` - best value of the initial population.
+        """
+        self.best_value = min(self.best_value, best_value)
+        self.__start = time.monotonic()
+
+    def update(self, values: np.ndarray, count: bool or np.ndarray = True) -> str or None:
+        """
+        Records values of newly evaluated points (in order of evaluation), `count` - as in `BudgetLog.record(...)`.
+
+        Returns
+        -------
+        reason : str - reason of stopping the run, None if it should go on
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            charged = np.broadcast_to(np.asarray(count, dtype=bool), values.shape)
+            q_after = self.q_counter + np.cumsum(charged)       # used budget after every single evaluation
+            if self.target is not None and self.evaluations_to_target is None:
+                hits = np.flatnonzero(values <= self.target)
+                if len(hits):
+                    self.evaluations_to_target = int(q_after[hits[0]])
+            i = int(np.argmin(values))
+            if values[i] < self.best_value:
+                self.best_value = float(values[i])
+                self.last_improvement = int(q_after[i])
+            self.q_counter = int(q_after[-1])
+
+        if self.evaluations_to_target is not None:
+            self.reason = "target"
+        elif self.no_improvement is not None and self.q_counter - self.last_improvement >= self.no_improvement:
+            self.reason = "no_improvement"
+        elif self.wall_time is not None and self.time() >= self.wall_time:
+            self.reason = "wall_time"
+        return self.reason
+
+    def finish(self):
+        # run ended without meeting any rule
+        self.reason = self.reason if self.reason else "budget"
+
+    def time(self) -> float:
+        return self.elapsed + (time.monotonic() - self.__start if self.__start is not None else 0.0)
+
+    def get_state(self) -> dict:
+        # for checkpoints (see `utils.checkpoint.Checkpointer`)
+        return {"target": self.target, "no_improvement": self.no_improvement, "wall_time": self.wall_time,
+                "reason": self.reason, "evaluations_to_target": self.evaluations_to_target,
+                "q_counter": self.q_counter, "best_value": self.best_value,
+                "last_improvement": self.last_improvement, "elapsed": self.time()}
+
+    def set_state(self, state: dict):
+        self.target, self.no_improvement, self.wall_time = state["target"], state["no_improvement"], state["wall_time"]
+        self.reason, self.evaluations_to_target = state["reason"], state["evaluations_to_target"]
+        self.q_counter, self.best_value = state["q_counter"], state["best_value"]
+        self.last_improvement, self.elapsed = state["last_improvement"], state["elapsed"]
+        self.__start = time.monotonic()